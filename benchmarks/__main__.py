@@ -0,0 +1,47 @@
+"""
+Benchmarks of the client, they don't use network.
+
+    python -m benchmarks
+    python -m benchmarks --filter json --output results.json
+    python -m benchmarks --compare baseline.json --threshold 0.1
+"""
+import argparse
+import sys
+
+from . import bench_client, bench_json  # noqa: F401, registers benchmarks
+from .harness import find_regressions, load, print_results, run, save
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--filter", help="Run benchmarks containing this substring.")
+    parser.add_argument("--output", help="Save results to this JSON file.")
+    parser.add_argument("--compare", help="JSON file of results of a previous run.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Slowdown relative to --compare treated as a regression.",
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Multiplier of the number of calls."
+    )
+    args = parser.parse_args()
+
+    report = run(args.filter, args.scale)
+    baseline = load(args.compare) if args.compare else None
+    print_results(report, baseline)
+
+    if args.output:
+        save(report, args.output)
+
+    if baseline:
+        regressions = find_regressions(report, baseline, args.threshold)
+        if regressions:
+            print("Regressions: " + ", ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Benchmarks of the request/response hot path of the client."""
+import json
+from decimal import Decimal
+
+from tapi2.adapters import JSONAdapterMixin, TapiAdapter, generate_wrapper_from_adapter
+from tapi2.instrumentation import MetricsAggregator
+from tapi2.serializers import SimpleSerializer
+from tapi2.streaming import JSONArrayBody
+from tapi2.transports import MemoryTransport
+
+from .harness import benchmark
+from .transport import MemoryHTTPAdapter, memory_session
+
+API_ROOT = "https://api.bench.local"
+PAGE_COUNT = 50
+PAGE_SIZE = 100
+
+RESOURCE_MAPPING = {
+    "campaigns": {"resource": "v1/campaigns/", "docs": ""},
+    "campaign_stats": {"resource": "v1/campaigns/{campaign_id}/stats/{date}/", "docs": ""},
+    "reportRows": {"resource": "v1/report/", "docs": ""},
+    "items": {"resource": "v1/items/", "docs": "", "batch_param": "ids", "max_batch": 100},
+}
+
+
+class BenchAdapter(JSONAdapterMixin, TapiAdapter):
+    api_root = API_ROOT
+    resource_mapping = RESOURCE_MAPPING
+
+    def get_iterator_iteritems(self, response_data, **kwargs):
+        return response_data["data"]
+
+    def get_iterator_next_request_kwargs(self, response_data, request_kwargs, **kwargs):
+        page = response_data["page"]
+        if page < PAGE_COUNT:
+            return {"url": request_kwargs["url"], "params": {"page": page + 1}}
+
+
+BenchClient = generate_wrapper_from_adapter(BenchAdapter)
+
+
+def _page_body(page):
+    data = [{"id": page * PAGE_SIZE + i, "name": "row", "cost": 1.5} for i in range(PAGE_SIZE)]
+    return json.dumps({"data": data, "page": page}).encode()
+
+
+PAGES = {page: _page_body(page) for page in range(1, PAGE_COUNT + 1)}
+
+
+def _report_route(request):
+    page = int(request.url.rsplit("page=", 1)[1]) if "page=" in request.url else 1
+    return 200, PAGES[page]
+
+
+def _items_route(request):
+    ids = request.url.rsplit("ids=", 1)[1].split("%2C")
+    return 200, json.dumps({"data": [{"id": int(id)} for id in ids]}).encode()
+
+
+def make_client(**kwargs):
+    adapter = MemoryHTTPAdapter()
+    adapter.add("GET", API_ROOT + "/v1/campaigns/", (200, b'{"data": [{"id": 1}]}'))
+    adapter.add("POST", API_ROOT + "/v1/campaigns/", (200, b'{"result": true}'))
+    adapter.add("GET", API_ROOT + "/v1/report/", _report_route)
+    adapter.add("GET", API_ROOT + "/v1/items/", _items_route)
+    return BenchClient(session=memory_session(adapter), **kwargs)
+
+
+@benchmark("resource_getattr", number=20000)
+def resource_getattr():
+    client = make_client()
+    return lambda: client.campaigns
+
+
+@benchmark("resource_getattr_camel_case", number=20000)
+def resource_getattr_camel_case():
+    client = make_client()
+    return lambda: client.report_rows
+
+
+@benchmark("resource_call_url_template", number=20000)
+def resource_call_url_template():
+    client = make_client()
+    return lambda: client.campaign_stats(campaign_id=123, date="2020-01-01")
+
+
+@benchmark("make_request_get", number=3000)
+def make_request_get():
+    client = make_client()
+    return lambda: client.campaigns().get(params={"limit": 10})
+
+
+@benchmark("make_request_post", number=3000)
+def make_request_post():
+    client = make_client()
+    body = {"campaigns": [{"id": i, "name": "campaign"} for i in range(10)]}
+    return lambda: client.campaigns().post(data=body)
+
+
+@benchmark("iter_items_{}_pages".format(PAGE_COUNT), number=20)
+def iter_items_pages():
+    client = make_client()
+
+    def run():
+        response = client.report_rows().get()
+        for _ in response().iter_items():
+            pass
+
+    return run
+
+
+@benchmark("serializer_nested_payload", number=200)
+def serializer_nested_payload():
+    serializer = SimpleSerializer()
+    payload = {
+        "rows": [
+            {"id": i, "name": "row", "cost": Decimal("1.5"), "tags": ["a", "b"], "extra": None}
+            for i in range(1000)
+        ]
+    }
+    return lambda: serializer.serialize(payload)
+
+
+@benchmark("wrap_100k_results", number=3)
+def wrap_100k_results():
+    client = make_client()
+    items = [{"id": i} for i in range(100000)]
+
+    def run():
+        return [client._wrap_in_tapi(item) for item in items]
+
+    return run
+
+
+@benchmark("executor_to_decimal", number=20000)
+def executor_to_decimal():
+    client = make_client()
+    executor = client._wrap_in_tapi("1.5")()
+    return lambda: executor.to_decimal()
+
+
+@benchmark("serializer_primitive_payload", number=200)
+def serializer_primitive_payload():
+    serializer = SimpleSerializer()
+    payload = {
+        "rows": [{"id": i, "name": "row", "cost": 1.5, "tags": ["a", "b"], "extra": None} for i in range(1000)]
+    }
+    return lambda: serializer.serialize(payload)
+
+
+@benchmark("make_request_post_bytes_10mb", number=200)
+def make_request_post_bytes():
+    client = make_client()
+    body = bytes(10 * 1024 * 1024)
+    return lambda: client.campaigns().post(data=body)
+
+
+def _upload_records():
+    return ({"id": i, "name": "row", "cost": Decimal("1.5")} for i in range(10000))
+
+
+@benchmark("make_request_post_10k_records", number=20)
+def make_request_post_records():
+    client = make_client()
+    return lambda: client.campaigns().post(data=list(_upload_records()))
+
+
+@benchmark("make_request_post_10k_records_streamed", number=20)
+def make_request_post_records_streamed():
+    client = make_client()
+    return lambda: client.campaigns().post(data=JSONArrayBody(_upload_records()))
+
+
+@benchmark("batch_500_coalesced_gets", number=20)
+def batch_coalesced_gets():
+    client = make_client()
+    requests = [(client.items(), "get", {"params": {"ids": id}}) for id in range(500)]
+    return lambda: client.batch(requests)
+
+
+@benchmark("make_request_get_memory_transport", number=3000)
+def make_request_get_memory_transport():
+    transport = MemoryTransport(max_calls=0)
+    transport.add("GET", API_ROOT + "/v1/campaigns/", body=b'{"data": [{"id": 1}]}')
+    client = BenchClient(transport=transport)
+    return lambda: client.campaigns().get(params={"limit": 10})
+
+
+@benchmark("make_request_get_instrumented", number=3000)
+def make_request_get_instrumented():
+    transport = MemoryTransport(max_calls=0)
+    transport.add("GET", API_ROOT + "/v1/campaigns/", body=b'{"data": [{"id": 1}]}')
+    client = BenchClient(transport=transport, instruments=[MetricsAggregator()])
+    return lambda: client.campaigns().get(params={"limit": 10})
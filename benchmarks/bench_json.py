@@ -0,0 +1,41 @@
+"""Decode and encode paths of JSONAdapterMixin with the installed JSON backends."""
+import json
+
+from tapi2.json_backends import JSON_BACKENDS, get_json_backend
+
+from .harness import benchmark
+
+SMALL = json.dumps({"data": {"id": 1, "name": "campaign", "status": "ON"}}).encode()
+LARGE = json.dumps(
+    {"data": [{"id": i, "name": "campaign %s" % i, "cost": i * 1.5} for i in range(20000)]}
+).encode()
+
+BODIES = (("small", SMALL, 20000), ("large", LARGE, 20))
+
+
+def _register(body_name, body, number):
+    @benchmark("json_decode_{}_stdlib_strip_decode".format(body_name), number=number)
+    def strip_decode():
+        def decode():
+            if body.strip():
+                return json.loads(body.decode())
+
+        return decode
+
+    for backend_class in JSON_BACKENDS:
+        backend = get_json_backend(backend_class.name)
+        if backend.name != backend_class.name:
+            continue  # not installed
+
+        @benchmark("json_decode_{}_{}".format(body_name, backend.name), number=number)
+        def decode(backend=backend):
+            return lambda: backend.loads(body)
+
+        @benchmark("json_encode_{}_{}".format(body_name, backend.name), number=number)
+        def encode(backend=backend):
+            data = backend.loads(body)
+            return lambda: backend.dumps(data)
+
+
+for _body_name, _body, _number in BODIES:
+    _register(_body_name, _body, _number)
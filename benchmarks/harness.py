@@ -0,0 +1,121 @@
+"""Registry of benchmarks, measurement and comparison of results."""
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+BENCHMARKS = []
+
+
+def benchmark(name, number=1000):
+    """
+    Registers a benchmark. The decorated function prepares everything
+    needed and returns the callable whose calls are measured.
+    """
+
+    def decorator(setup):
+        BENCHMARKS.append((name, number, setup))
+        return setup
+
+    return decorator
+
+
+def _percentile(sorted_values, percent):
+    index = min(int(len(sorted_values) * percent / 100), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def measure(func, number):
+    for _ in range(min(number, 100)):
+        func()
+
+    timings = []
+    gc_collections = sum(stat["collections"] for stat in gc.get_stats())
+    started = time.perf_counter()
+    for _ in range(number):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    total = time.perf_counter() - started
+    gc_collections = sum(stat["collections"] for stat in gc.get_stats()) - gc_collections
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    for _ in range(min(number, 100)):
+        func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "number": number,
+        "ops_per_sec": number / total,
+        "mean_us": statistics.mean(timings) * 1e6,
+        "p50_us": _percentile(timings, 50) * 1e6,
+        "p99_us": _percentile(timings, 99) * 1e6,
+        "peak_memory_kb": (peak - baseline) / 1024,
+        "gc_collections": gc_collections,
+    }
+
+
+def run(name_filter=None, scale=1.0):
+    results = {}
+    for name, number, setup in BENCHMARKS:
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = measure(setup(), max(int(number * scale), 1))
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def print_results(report, baseline=None):
+    print(
+        "{:<36} {:>12} {:>10} {:>10} {:>11} {:>5} {:>9}".format(
+            "benchmark", "ops/sec", "p50 us", "p99 us", "peak KiB", "gc", "change"
+        )
+    )
+    baseline_results = (baseline or {}).get("results", {})
+    for name, result in report["results"].items():
+        change = ""
+        if name in baseline_results:
+            ratio = result["ops_per_sec"] / baseline_results[name]["ops_per_sec"]
+            change = "{:+.1%}".format(ratio - 1)
+        print(
+            "{:<36} {:>12.1f} {:>10.1f} {:>10.1f} {:>11.1f} {:>5} {:>9}".format(
+                name,
+                result["ops_per_sec"],
+                result["p50_us"],
+                result["p99_us"],
+                result["peak_memory_kb"],
+                result["gc_collections"],
+                change,
+            )
+        )
+
+
+def find_regressions(report, baseline, threshold):
+    """Names of benchmarks which have become slower than the threshold."""
+    regressions = []
+    for name, result in report["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if old and result["ops_per_sec"] < old["ops_per_sec"] * (1 - threshold):
+            regressions.append(name)
+    return regressions
+
+
+def save(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,51 @@
+"""In-process transport adapter of requests, no sockets are opened."""
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter
+
+from tapi2.transports import build_response
+from tapi2.utils import is_stream_body
+
+
+class MemoryHTTPAdapter(BaseAdapter):
+    """
+    Responds to requests of the mounted session from the registered routes.
+    A route is a pair (status, body) or a function of the prepared request
+    returning such a pair.
+    """
+
+    def __init__(self):
+        super(MemoryHTTPAdapter, self).__init__()
+        self.routes = {}
+
+    def add(self, method, url, route):
+        self.routes[(method.upper(), url)] = route
+
+    def send(self, request, **kwargs):
+        # Stream bodies are read out, as they would be by a socket.
+        if hasattr(request.body, "read"):
+            while request.body.read(64 * 1024):
+                pass
+        elif is_stream_body(request.body):
+            for _ in request.body:
+                pass
+
+        scheme, netloc, path, _, _ = urlsplit(request.url)
+        route = self.routes[(request.method, urlunsplit((scheme, netloc, path, "", "")))]
+        if callable(route):
+            route = route(request)
+        status, body = route
+        return build_response(
+            request, status, {"Content-Type": "application/json"}, body
+        )
+
+    def close(self):
+        pass
+
+
+def memory_session(adapter):
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -40,6 +40,7 @@ setup(
     packages=[package],
     include_package_data=True,
     install_requires=['requests'],
+    extras_require={'async': ['httpx']},
     license="MIT",
     zip_safe=False,
     keywords="tapi,wrapper,api",
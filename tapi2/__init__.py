@@ -7,5 +7,10 @@ __version__ = '0.1.3'
 from .adapters import (
     generate_wrapper_from_adapter,
     TapiAdapter,
-    JSONAdapterMixin
+    JSONAdapterMixin,
+    StreamingLinesAdapterMixin,
+    NDJSONAdapterMixin,
+    CSVAdapterMixin,
+    TSVAdapterMixin,
 )
+from .streaming import JSONArrayBody
@@ -1,7 +1,10 @@
+import codecs
+import csv
 import json
-import re
 from typing import List
 
+from .cache import make_cache_key
+from .json_backends import get_json_backend
 from .exceptions import (
     ResponseProcessException,
     ClientError,
@@ -9,7 +12,15 @@ from .exceptions import (
     NotFound404Error,
 )
 from .serializers import SimpleSerializer
+from .streaming import JSONArrayBody, iter_json_array_chunks, iter_json_items
 from .tapi import TapiInstantiator, TapiClientExecutor
+from .utils import (
+    compile_url_template,
+    is_raw_body,
+    is_stream_body,
+    resource_name_aliases,
+    to_snake_case,
+)
 
 
 def generate_wrapper_from_adapter(adapter_class):
@@ -33,7 +44,10 @@ class Resource:
         :param url_docs: URL official documentation.
         :param allowed_http_methods: Literal["GET", "POST", "PUT", "OPTIONS", "DELETE", "PATCH"]
         :param descriptions: Descriptions.
-        :param kwargs:
+        :param kwargs: Parameters of the resource, for example batch_param="ids"
+            coalesces requests of batch() into one, see TapiAdapter.get_batch_key.
+            batch_threads=True coalesces single requests from threads too,
+            at the cost of up to batch_window seconds of latency of every request.
         """
         self.name = name
         self.url = url
@@ -61,34 +75,121 @@ class TapiAdapter(object):
     serializer_class = SimpleSerializer
     api_root = NotImplementedError
     resource_mapping: dict = NotImplementedError
+    # Headers whose values are a part of the response cache key.
+    cache_key_headers = ("Authorization",)
+    cache_methods = ("GET", "HEAD")
+    # Idempotent methods whose identical requests in flight share one response.
+    single_flight_methods = ("GET", "HEAD")
+    # Defaults of the batching parameters of resources, see get_batch_key.
+    max_batch = 100
+    batch_window = 0.005
+    # tapi2.retry.RetryPolicy of failed requests and transport errors,
+    # None to repeat requests only when retry_request returns True.
+    retry_policy = None
+    # "orjson", "ujson", "json" or "auto", falls back to the next installed one.
+    json_backend = "json"
 
     def __init__(
-        self, serializer_class=None, resource_mapping: List[Resource] = None, **kwargs
+        self,
+        serializer_class=None,
+        resource_mapping: List[Resource] = None,
+        json_backend=None,
+        **kwargs
     ):
+        self._json = get_json_backend(json_backend or self.json_backend)
+
         if serializer_class:
             self.serializer = serializer_class()
         else:
             self.serializer = self.get_serializer()
+        # Bound `to_*` methods of the serializer by name.
+        self._serializer_methods = {
+            name: getattr(self.serializer, name)
+            for name in dir(self.serializer)
+            if name.startswith("to_")
+        }
 
         if resource_mapping:
+            # Resources of this client only, the mapping of the class is not changed.
+            self.resource_mapping = dict(self.resource_mapping)
             for resource in resource_mapping:
                 self.resource_mapping.update(resource.dict())
 
+    def _find_resource_name(self, name):
+        for alias in resource_name_aliases(name):
+            if alias in self.resource_mapping:
+                return alias
+        return None
+
+    def _get_resource_index(self):
+        """
+        Index of resource names by their aliases (snake_case, camelCase, PascalCase),
+        it is built once per resource mapping: in the adapter class,
+        or in the adapter if it has resources of its own. Unknown names are added
+        to the index with None, so that they are not looked up again.
+        """
+        owner = self if "resource_mapping" in self.__dict__ else type(self)
+        mapping = owner.resource_mapping
+        if not isinstance(mapping, dict):
+            mapping = {}
+        version = (id(mapping), len(mapping))
+
+        if owner.__dict__.get("_resource_index_version") != version:
+            index = {}
+            for name in mapping:
+                for alias in resource_name_aliases(to_snake_case(name)):
+                    index.setdefault(alias, self._find_resource_name(alias) or name)
+            owner._resource_index = index
+            owner._resource_urls = {}
+            owner._resource_index_version = version
+
+        return owner._resource_index
+
+    def _resolve_resource_name(self, name):
+        index = self._get_resource_index()
+        try:
+            return index[name]
+        except KeyError:
+            resource_name = index[name] = self._find_resource_name(name)
+            return resource_name
+
+    def _get_resource_url(self, api_params, resource_name):
+        """Joined url of api root and resource, cached by api root."""
+        api_root = self.get_api_root(api_params, resource_name=resource_name)
+        key = (api_root, resource_name)
+        try:
+            return self._resource_urls[key]
+        except KeyError:
+            resource = self.resource_mapping[resource_name]["resource"]
+            url = api_root.rstrip("/") + "/" + resource.lstrip("/")
+            self._resource_urls[key] = url
+            return url
+
+    @classmethod
+    def _get_native_methods(cls):
+        """Public attributes added by the adapter class, they are computed once per class."""
+        native_methods = cls.__dict__.get("_native_methods")
+        if native_methods is None:
+            base_attributes = {
+                *dir(TapiAdapter),
+                *dir(TapiClientExecutor),
+                *dir(JSONAdapterMixin),
+                *dir(CSVAdapterMixin),
+                *dir(NDJSONAdapterMixin),
+                "serializer",
+            }
+            native_methods = frozenset(
+                attr
+                for attr in dir(cls)
+                if not attr.startswith("_") and attr not in base_attributes
+            )
+            cls._native_methods = native_methods
+        return native_methods
+
     @property
     def native_methods(self):
         """Make custom attributes and methods to native"""
-        base_attributes = {
-            *dir(TapiAdapter),
-            *dir(TapiClientExecutor),
-            *dir(JSONAdapterMixin),
-            "serializer",
-        }
-        a = [
-            attr
-            for attr in dir(self)
-            if not attr.startswith("_") and attr not in base_attributes
-        ]
-        return a
+        return self._get_native_methods()
 
     def _method_to_native(self, method_name, **kwargs):
         return getattr(self, method_name)(**kwargs)
@@ -97,22 +198,30 @@ class TapiAdapter(object):
         return self.serializer.deserialize(method_name, value, **kwargs)
 
     def _get_to_native_method(self, method_name, data, **context):
-        if not self.serializer and method_name not in self.native_methods:
+        if method_name in self._get_native_methods():
+
+            def to_native_wrapper(**kwargs):
+                return self._method_to_native(
+                    method_name, data=data, **{**context, **kwargs}
+                )
+
+            return to_native_wrapper
+
+        if not self.serializer:
             raise NotImplementedError(
                 "This client does not have a serializer and not have native methods"
             )
 
-        if method_name in self.native_methods:
+        method = self._serializer_methods.get(method_name)
+        if method is None:
 
             def to_native_wrapper(**kwargs):
-                return self._method_to_native(
-                    method_name, data=data, **{**context, **kwargs}
-                )
+                return self._value_to_native(method_name, data, **kwargs)
 
         else:
 
             def to_native_wrapper(**kwargs):
-                return self._value_to_native(method_name, data, **kwargs)
+                return method(data, **kwargs)
 
         return to_native_wrapper
 
@@ -124,26 +233,132 @@ class TapiAdapter(object):
         return self.api_root
 
     def fill_resource_template_url(self, template, params, resource):
-        """Create of url request"""
+        """
+        Create of url request.
+        The template is compiled once, values are encoded as path segments.
+        """
+        url_template = compile_url_template(template)
         try:
-            return template.format(**params)
+            return url_template.fill(params)
         except KeyError:
-            all_keys = re.findall(r"{(.[^\}]*)", template)
-            range_not_set_keys = set(all_keys) - set(params.keys())
-            not_set_keys = "', '".join(range_not_set_keys)
-
+            not_set_keys = url_template.missing(params)
             raise TypeError(
                 "{}() missing {} required url params: '{}'".format(
-                    resource, len(range_not_set_keys), not_set_keys
+                    resource, len(not_set_keys), "', '".join(not_set_keys)
                 )
             )
 
     def get_request_kwargs(self, api_params, *args, **kwargs):
-        """Adding parameters to a request"""
+        """
+        Adding parameters to a request.
+        Bytes-like, file-like and iterator bodies are passed to the transport as is,
+        iterators are sent with chunked transfer encoding.
+        """
+        if is_raw_body(kwargs.get("data")):
+            return kwargs
+
         serialized = self.serialize_data(kwargs.get("data"))
         kwargs["data"] = self.format_data_to_request(serialized)
         return kwargs
 
+    def get_cache_key(self, request_method, request_kwargs, resource=None, **kwargs):
+        """
+        Key of the response cache, None if the response should not be cached.
+        By default GET and HEAD requests are cached, requests with stream bodies are not,
+        resources can turn it on or off with the "cache" parameter,
+        for example Resource("report", "report/", cache=True, cache_ttl=60).
+        """
+        resource_cache = (resource or {}).get("cache")
+        if resource_cache is False or is_stream_body(request_kwargs.get("data")):
+            return None
+        if resource_cache is None and request_method.upper() not in self.cache_methods:
+            return None
+
+        return make_cache_key(request_method, request_kwargs, self.cache_key_headers)
+
+    def get_single_flight_key(self, request_method, request_kwargs, resource=None, **kwargs):
+        """
+        Key of a request that shares one response with the identical requests
+        in flight, None if the request is always sent.
+        It is used by the clients created with single_flight=True,
+        resources can turn it off with the "single_flight" parameter.
+        """
+        if (resource or {}).get("single_flight") is False:
+            return None
+        if (
+            request_method.upper() not in self.single_flight_methods
+            or request_kwargs.get("stream")
+            or is_stream_body(request_kwargs.get("data"))
+        ):
+            return None
+
+        return make_cache_key(request_method, request_kwargs, self.cache_key_headers)
+
+    def get_batch_key(self, request_method, request_kwargs, resource=None, **kwargs):
+        """
+        Pair (group, key) of a request that is coalesced with the requests
+        of the same group into one request, None if the request is sent as is.
+        Resources turn it on with the "batch_param" parameter, for example
+        Resource("items", "items/", batch_param="ids", max_batch=500, batch_window=0.01),
+        then GET requests with params={"ids": 1} made within batch_window seconds
+        are sent as one request with params={"ids": "1,2,..."}.
+        Synchronous clients coalesce the requests of batch() and iter_batch(),
+        a single get() is sent right away. With batch_threads=True the resource
+        coalesces single requests from several threads too, each of them
+        then waits up to batch_window seconds before it is sent.
+        """
+        batch_param = (resource or {}).get("batch_param")
+        params = request_kwargs.get("params")
+        if (
+            not batch_param
+            or request_method.upper() != "GET"
+            or request_kwargs.get("stream")
+            or not isinstance(params, dict)
+        ):
+            return None
+
+        key = params.get(batch_param)
+        if key is None or isinstance(key, (list, tuple, set)):
+            return None
+
+        group_params = {name: value for name, value in params.items() if name != batch_param}
+        group = make_cache_key(
+            request_method,
+            {**request_kwargs, "params": group_params},
+            self.cache_key_headers,
+        )
+        return group, key
+
+    def get_batch_request_kwargs(self, request_kwargs, keys, resource, **kwargs):
+        """Request kwargs of the batch of keys."""
+        separator = resource.get("batch_separator", ",")
+        params = {
+            **request_kwargs["params"],
+            resource["batch_param"]: separator.join(str(key) for key in keys),
+        }
+        return {**request_kwargs, "params": params}
+
+    def split_batch_response(self, response_data, keys, resource, **kwargs):
+        """
+        Data of a batch response for each of the keys, in the order of keys.
+        Records are matched to keys by the "batch_key" field of the resource
+        ("id" by default), None if there is no record for a key.
+        """
+        batch_key = resource.get("batch_key", "id")
+        records = {
+            str(record[batch_key]): record
+            for record in self.get_iterator_iteritems(response_data, **kwargs)
+        }
+        return [records.get(str(key)) for key in keys]
+
+    def update_rate_limit(self, rate_limiter, response, resource=None, **kwargs):
+        """
+        Corrects the rate limiter of the client or of the resource
+        by the response headers, for example:
+        rate_limiter.update(remaining=int(response.headers["X-RateLimit-Remaining"]))
+        """
+        pass
+
     def get_error_message(self, data, response=None):
         """Get error from response."""
         return str(data)
@@ -155,6 +370,9 @@ class TapiAdapter(object):
         elif 500 <= response.status_code < 600:
             raise ResponseProcessException(ServerError, None)
 
+        if request_kwargs.get("stream") and response.status_code < 400:
+            return self.stream_response_to_native(response)
+
         data = self.response_to_native(response)
 
         if 400 <= response.status_code < 500:
@@ -191,6 +409,14 @@ class TapiAdapter(object):
     def response_to_native(self, response):
         raise NotImplementedError()
 
+    def stream_response_to_native(self, response):
+        """
+        Processing of the response of the request with stream=True.
+        It should return a lazy iterable of records,
+        which is also used as items by the iterators of the executor.
+        """
+        return self.response_to_native(response)
+
     def get_iterator_iteritems(
         self, response_data, response, request_kwargs, api_params, **kwargs
     ):
@@ -209,6 +435,19 @@ class TapiAdapter(object):
     ):
         raise NotImplementedError()
 
+    def get_iterator_all_page_request_kwargs(
+        self, response_data, response, request_kwargs, api_params, **kwargs
+    ):
+        """
+        Request parameters of all the remaining pages,
+        if they are known from the first response (total count, number of pages).
+        Such pages are requested concurrently,
+        the url of the first request is used if it is not specified.
+        If it returns None, pages are requested one by one
+        with `get_iterator_next_request_kwargs`.
+        """
+        return None
+
     def is_authentication_expired(self, tapi_exception, *args, **kwargs):
         return False
 
@@ -223,25 +462,38 @@ class TapiAdapter(object):
         response,
         request_kwargs,
         api_params,
+        retry=False,
         **kwargs
     ):
         """
         Conditions for repeating a request.
         If it returns True, the request will be repeated.
+
+        :param retry: Decision of the retry policy, the request is repeated
+            after the backoff delay of the policy.
+            Return it to follow the policy, or override it.
         """
-        return False
+        return retry
 
     def __str__(self, data=None, request_kwargs=None, response=None, api_params=None):
         raise NotImplementedError()
 
 
 class JSONAdapterMixin(object):
+    # Key or sequence of keys of the array of records in streamed responses,
+    # None if the array is the root of the document.
+    stream_items_path = None
+    stream_chunk_size = 64 * 1024
+    default_headers = {"Content-Type": "application/json"}
+
     def get_request_kwargs(self, api_params, *args, **kwargs):
         request_kwargs = super(JSONAdapterMixin, self).get_request_kwargs(
             api_params, *args, **kwargs
         )
+        # Headers of api_params may be changed by refresh_authentication,
+        # so they are merged on every request.
         request_kwargs["headers"] = {
-            "Content-Type": "application/json",
+            **self.default_headers,
             **api_params.get("headers", {}),
             **request_kwargs.get("headers", {}),
         }
@@ -249,19 +501,158 @@ class JSONAdapterMixin(object):
         return request_kwargs
 
     def format_data_to_request(self, data):
+        if isinstance(data, JSONArrayBody):
+            return iter_json_array_chunks(
+                data.records, self._dump_records, self.stream_chunk_size
+            )
         if data:
-            return json.dumps(data)
+            return self._json.dumps(data)
+
+    def _dump_records(self, records):
+        return self._json.dumps(self.serialize_data(records))
 
     def response_to_native(self, response):
-        if response.content.strip():
+        content = response.content
+        if content and not content.isspace():
             try:
-                return json.loads(response.content.decode())
-            except json.JSONDecodeError:
+                return self._json.loads(content)
+            except ValueError:
                 return response.text
 
+    def stream_response_to_native(self, response):
+        return iter_json_items(
+            response.iter_content(self.stream_chunk_size),
+            path=self.stream_items_path,
+            encoding=response.encoding or "utf-8",
+        )
+
     def get_error_message(self, data, response=None):
-        if not data and response.content.strip():
-            data = json.loads(response.content.decode())
+        if not data and response.content and not response.content.isspace():
+            data = self._json.loads(response.content)
 
         if data:
             return data.get("error", None)
+
+
+class StreamingLinesAdapterMixin(object):
+    """
+    Line by line processing of large text responses.
+    Requests are streamed by default and rows are yielded lazily,
+    so only a small buffer of the body is held in memory.
+    Error responses are processed by the next adapter in MRO
+    (for example JSONAdapterMixin) or returned as text.
+    """
+
+    stream_chunk_size = 64 * 1024
+    stream_encoding = "utf-8"
+    # Names (or indexes) of the columns to keep, None keeps all of them.
+    columns = None
+
+    def get_request_kwargs(self, api_params, *args, **kwargs):
+        request_kwargs = super(StreamingLinesAdapterMixin, self).get_request_kwargs(
+            api_params, *args, **kwargs
+        )
+        request_kwargs.setdefault("stream", True)
+        return request_kwargs
+
+    def get_single_flight_key(self, request_method, request_kwargs, **kwargs):
+        # Streamed responses are read once, they can not be shared.
+        if request_kwargs.get("stream", True):
+            return None
+        return super(StreamingLinesAdapterMixin, self).get_single_flight_key(
+            request_method, request_kwargs, **kwargs
+        )
+
+    def format_data_to_request(self, data):
+        try:
+            return super(StreamingLinesAdapterMixin, self).format_data_to_request(data)
+        except NotImplementedError:
+            return data
+
+    def iter_lines(self, response):
+        """Decoded lines of the body, with their line endings and empty lines."""
+        decoder = codecs.getincrementaldecoder(self.stream_encoding)()
+        tail = ""
+        for chunk in response.iter_content(chunk_size=self.stream_chunk_size):
+            lines = (tail + decoder.decode(chunk)).split("\n")
+            # The last line can continue in the next chunk.
+            tail = lines.pop()
+            for line in lines:
+                yield line + "\n"
+
+        tail += decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def parse_lines(self, lines):
+        return lines
+
+    def response_to_native(self, response):
+        if response.status_code >= 400:
+            try:
+                return super(StreamingLinesAdapterMixin, self).response_to_native(
+                    response
+                )
+            except NotImplementedError:
+                return response.text
+
+        return self.parse_lines(self.iter_lines(response))
+
+    def stream_response_to_native(self, response):
+        return self.response_to_native(response)
+
+    def get_iterator_items(self, data, **kwargs):
+        return data
+
+    def get_iterator_iteritems(self, response_data, **kwargs):
+        return response_data
+
+
+class NDJSONAdapterMixin(StreamingLinesAdapterMixin):
+    """Newline delimited JSON, every line is a record."""
+
+    def parse_lines(self, lines):
+        columns = self.columns
+        for line in lines:
+            if line.isspace():
+                continue
+            record = self._json.loads(line)
+            if columns is not None:
+                record = {column: record.get(column) for column in columns}
+            yield record
+
+
+class CSVAdapterMixin(StreamingLinesAdapterMixin):
+    """
+    Rows of CSV are yielded as dicts if the first line is a header,
+    otherwise as lists.
+    """
+
+    csv_delimiter = ","
+    csv_quoting = csv.QUOTE_MINIMAL
+    csv_header = True
+
+    def parse_lines(self, lines):
+        reader = csv.reader(
+            lines, delimiter=self.csv_delimiter, quoting=self.csv_quoting
+        )
+        header = next(reader, None) if self.csv_header else None
+
+        if header is None:
+            columns = self.columns
+            for row in reader:
+                if row:
+                    yield row if columns is None else [row[i] for i in columns]
+            return
+
+        columns = header if self.columns is None else list(self.columns)
+        indexes = [header.index(column) for column in columns]
+        for row in reader:
+            # Empty lines are skipped as csv.DictReader does.
+            if row:
+                yield {column: row[i] for column, i in zip(columns, indexes)}
+
+
+class TSVAdapterMixin(CSVAdapterMixin):
+    csv_delimiter = "\t"
+    csv_quoting = csv.QUOTE_NONE
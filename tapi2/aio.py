@@ -0,0 +1,336 @@
+from __future__ import unicode_literals
+
+import asyncio
+import functools
+import inspect
+from collections import deque
+
+from .batching import AsyncRequestBatcher, AsyncSingleFlight
+from .tapi import (
+    _SEND,
+    _SLEEP,
+    TapiClient,
+    TapiClientExecutor,
+    _parse_batch_request,
+)
+from .transports import HttpxAsyncTransport
+
+
+async def _maybe_await(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class AsyncTapiClient(TapiClient):
+    __slots__ = ()
+    _single_flight_class = AsyncSingleFlight
+
+    def __init__(self, *args, transport=None, **kwargs):
+        if kwargs.get("context") is None:
+            transport = transport or HttpxAsyncTransport()
+            kwargs.setdefault("batcher", AsyncRequestBatcher())
+        super(AsyncTapiClient, self).__init__(*args, transport=transport, **kwargs)
+
+    async def close(self):
+        await self._transport.close()
+
+    def _run_batch(self, requests, max_workers):
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def run(index, request):
+            executor, method, kwargs = _parse_batch_request(request)
+            try:
+                # Coalesced requests do not take the slots of workers.
+                future = executor._submit_to_batch(method.upper(), **kwargs)
+                if future is not None:
+                    return index, await future
+                async with semaphore:
+                    return index, await getattr(executor, method)(**kwargs)
+            except Exception as exc:
+                return index, exc
+
+        return [run(index, request) for index, request in enumerate(requests)]
+
+    async def batch(self, requests, max_workers=10):
+        """
+        Executes requests concurrently.
+        Results are returned in the order of requests,
+        if a request fails, its exception is returned instead of the result.
+        """
+        results = await asyncio.gather(*self._run_batch(requests, max_workers))
+        return [result for _, result in results]
+
+    gather = batch
+
+    async def iter_batch(self, requests, max_workers=10):
+        """Yields pairs (index of request, result) in the order of completion."""
+        for coroutine in asyncio.as_completed(self._run_batch(requests, max_workers)):
+            yield await coroutine
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+class AsyncTapiClientExecutor(AsyncTapiClient, TapiClientExecutor):
+    """
+    Same as TapiClientExecutor, but request methods are coroutines
+    and iterators are asynchronous generators.
+    The adapter hooks `refresh_authentication` and `retry_request`
+    may be either regular functions or coroutines.
+    """
+
+    __slots__ = ()
+
+    async def _send_batch(self, request_method, request_kwargs, keys):
+        result = await self._send_request(
+            request_method, **self._get_batch_request_kwargs(request_kwargs, keys)
+        )
+        return self._split_batch_response(result, keys)
+
+    async def _make_request(
+        self, request_method, refresh_token=None, repeat_number=0, *args, **kwargs
+    ):
+        future = self._submit_to_batch(request_method, *args, **kwargs)
+        if future is not None:
+            return await future
+
+        key = self._get_single_flight_key(request_method, **kwargs)
+        if key is not None:
+            result, shared = await self._single_flight.do(
+                key,
+                functools.partial(
+                    self._send_request,
+                    request_method,
+                    refresh_token,
+                    repeat_number,
+                    *args,
+                    **kwargs
+                ),
+            )
+            return result._wrap_in_tapi(result._data) if shared else result
+
+        return await self._send_request(
+            request_method, refresh_token, repeat_number, *args, **kwargs
+        )
+
+    async def _send_request(self, request_method, *args, **kwargs):
+        steps = self._request_steps(request_method, *args, **kwargs)
+        try:
+            action, argument = next(steps)
+            while True:
+                if action is _SEND:
+                    try:
+                        value = await self._transport.send(request_method, **argument)
+                    except Exception as exc:
+                        action, argument = steps.throw(exc)
+                        continue
+                elif action is _SLEEP:
+                    value = await asyncio.sleep(argument)
+                else:
+                    value = await _maybe_await(argument)
+                action, argument = steps.send(value)
+        except StopIteration as stop:
+            return stop.value
+
+    async def _request_next_page(self, executor):
+        next_request_kwargs = executor._get_iterator_next_request_kwargs()
+        if not next_request_kwargs:
+            return None
+
+        request_method = executor._response.request.method.lower()
+        method = getattr(self, request_method)
+        response = await method(**next_request_kwargs)
+        return response()
+
+    async def _instrument_pages(self, executors):
+        page = 0
+        try:
+            async for executor in executors:
+                page += 1
+                self._emit("on_page", executor._get_page_event(page))
+                yield executor
+        finally:
+            await executors.aclose()
+
+    async def _iter_page_executors(
+        self, max_requests=None, prefetch=None, concurrency=None, ordered=True
+    ):
+        all_page_request_kwargs = self._get_iterator_all_page_request_kwargs()
+        if all_page_request_kwargs is not None:
+            async for executor in self._iter_known_executors(
+                all_page_request_kwargs,
+                max_requests,
+                concurrency or prefetch,
+                ordered,
+            ):
+                yield executor
+            return
+
+        if prefetch:
+            async for executor in self._iter_prefetched_executors(
+                max_requests, prefetch
+            ):
+                yield executor
+            return
+
+        executor = self
+        request_count = 1
+        while executor is not None:
+            yield executor
+            if self._reached_max_limits(request_count, None, max_requests, None):
+                break
+            executor = await self._request_next_page(executor)
+            request_count += 1
+
+    async def _iter_known_executors(
+        self, all_page_request_kwargs, max_requests, concurrency, ordered
+    ):
+        yield self
+
+        request_kwargs_list = list(all_page_request_kwargs)
+        if max_requests is not None:
+            request_kwargs_list = request_kwargs_list[: max(max_requests - 1, 0)]
+
+        request_method = self._response.request.method.lower()
+        method = getattr(self, request_method)
+        url = self._request_kwargs["url"]
+
+        async def request_page(request_kwargs):
+            response = await method(**{"url": url, **request_kwargs})
+            return response()
+
+        concurrency = max(concurrency or 1, 1)
+        request_kwargs_iter = iter(request_kwargs_list)
+        pending = deque()
+
+        def submit():
+            while len(pending) < concurrency:
+                request_kwargs = next(request_kwargs_iter, None)
+                if request_kwargs is None:
+                    break
+                pending.append(asyncio.ensure_future(request_page(request_kwargs)))
+
+        try:
+            submit()
+            while pending:
+                if ordered:
+                    done = [pending.popleft()]
+                else:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        pending.remove(task)
+
+                for task in done:
+                    executor = await task
+                    submit()
+                    yield executor
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _iter_prefetched_executors(self, max_requests, prefetch):
+        results = asyncio.Queue()
+        slots = asyncio.Semaphore(prefetch)
+
+        async def produce():
+            executor = self
+            request_count = 1
+            try:
+                while not self._reached_max_limits(
+                    request_count, None, max_requests, None
+                ):
+                    await slots.acquire()
+                    executor = await self._request_next_page(executor)
+                    if executor is None:
+                        break
+                    results.put_nowait(executor)
+                    request_count += 1
+            except Exception as exc:
+                results.put_nowait(exc)
+            finally:
+                results.put_nowait(None)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            yield self
+            while True:
+                executor = await results.get()
+                if executor is None:
+                    break
+                if isinstance(executor, Exception):
+                    raise executor
+                slots.release()
+                yield executor
+        finally:
+            producer.cancel()
+
+    async def iter_items(
+        self,
+        max_pages=None,
+        max_items=None,
+        prefetch=None,
+        concurrency=None,
+        ordered=True,
+    ):
+        page_count = 0
+        item_count = 0
+
+        executors = self._iter_executors(max_pages, prefetch, concurrency, ordered)
+        try:
+            async for executor in executors:
+                iterator_list = executor._get_iterator_iteritems()
+                if not iterator_list or self._reached_max_limits(
+                    page_count, item_count, max_pages, max_items
+                ):
+                    break
+
+                for item in iterator_list:
+                    if self._reached_max_limits(
+                        page_count, item_count, max_pages, max_items
+                    ):
+                        break
+                    yield item
+                    item_count += 1
+
+                page_count += 1
+        finally:
+            await executors.aclose()
+
+    async def pages(self, max_pages=None, prefetch=None, concurrency=None, ordered=True):
+        page_count = 0
+
+        executors = self._iter_executors(
+            prefetch=prefetch, concurrency=concurrency, ordered=ordered
+        )
+        try:
+            async for executor in executors:
+                pages = executor._get_iterator_pages()
+                if not pages:
+                    break
+
+                for page in pages:
+                    if self._reached_max_limits(page_count, None, max_pages, None):
+                        break
+
+                    yield self._wrap_in_tapi(page)
+
+                    page_count += 1
+
+                if self._reached_max_limits(page_count, None, max_pages, None):
+                    break
+        finally:
+            await executors.aclose()
+
+    async def items(self, max_items=None):
+        for item in super(AsyncTapiClientExecutor, self).items(max_items):
+            yield item
+
+
+AsyncTapiClient._client_class = AsyncTapiClient
+AsyncTapiClient._executor_class = AsyncTapiClientExecutor
@@ -0,0 +1,213 @@
+from __future__ import unicode_literals
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class _Batch(object):
+    def __init__(self, send):
+        self.send = send
+        # Futures of the callers by key, a key requested twice is sent once.
+        self.futures = OrderedDict()
+        self.handle = None
+
+    def add(self, key, future):
+        self.futures.setdefault(key, []).append(future)
+        return future
+
+    def set_results(self, results):
+        for futures, result in zip(self.futures.values(), results):
+            for future in futures:
+                if not future.done():
+                    future.set_result(result)
+
+    def set_exception(self, exception):
+        for futures in self.futures.values():
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exception)
+
+
+class RequestBatcher(object):
+    """
+    Coalesces requests of a group submitted within a time window
+    into one request. A batch is sent when the window is over
+    or when it reaches max_batch keys.
+    Windows are tracked by one scheduler thread,
+    batches are sent by a pool of max_workers threads.
+    """
+
+    def __init__(self, max_workers=10):
+        self._lock = threading.Condition()
+        self._batches = {}
+        # Heap of (deadline, number, group, batch).
+        self._deadlines = []
+        self._counter = itertools.count()
+        self._max_workers = max_workers
+        self._scheduler = None
+        self._executor = None
+
+    def submit(self, group, key, send, max_batch, window):
+        """
+        :param send: Function that takes a list of keys
+            and returns a list of results in the same order.
+        :return: concurrent.futures.Future of the result for the key.
+        """
+        with self._lock:
+            batch = self._batches.get(group)
+            if batch is None:
+                batch = self._batches[group] = _Batch(send)
+                deadline = time.monotonic() + window
+                heapq.heappush(self._deadlines, (deadline, next(self._counter), group, batch))
+                self._start_scheduler()
+                self._lock.notify()
+
+            future = batch.add(key, Future())
+            if len(batch.futures) >= max_batch:
+                del self._batches[group]
+                self._send(batch)
+            return future
+
+    def _start_scheduler(self):
+        if self._scheduler is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="tapi-batch"
+            )
+            self._scheduler = threading.Thread(target=self._schedule, daemon=True)
+            self._scheduler.start()
+
+    def _schedule(self):
+        with self._lock:
+            while True:
+                if not self._deadlines:
+                    self._lock.wait()
+                    continue
+
+                deadline, _, group, batch = self._deadlines[0]
+                timeout = deadline - time.monotonic()
+                if timeout > 0:
+                    self._lock.wait(timeout)
+                    continue
+
+                heapq.heappop(self._deadlines)
+                # The batch may be already sent because it was full.
+                if self._batches.get(group) is batch:
+                    del self._batches[group]
+                    self._send(batch)
+
+    def _send(self, batch):
+        self._executor.submit(self._run, batch)
+
+    def _run(self, batch):
+        try:
+            results = batch.send(list(batch.futures))
+        except BaseException as exc:
+            batch.set_exception(exc)
+        else:
+            batch.set_results(results)
+
+
+class AsyncRequestBatcher(RequestBatcher):
+    """Same as RequestBatcher, but `send` is a coroutine function."""
+
+    def submit(self, group, key, send, max_batch, window):
+        """:return: asyncio.Future of the result for the key."""
+        loop = asyncio.get_running_loop()
+        batch = self._batches.get(group)
+        if batch is None:
+            batch = self._batches[group] = _Batch(send)
+            batch.handle = loop.call_later(window, self._flush, group, batch)
+
+        future = batch.add(key, loop.create_future())
+        if len(batch.futures) >= max_batch:
+            batch.handle.cancel()
+            self._flush(group, batch)
+        return future
+
+    def _flush(self, group, batch):
+        if self._batches.get(group) is batch:
+            del self._batches[group]
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch):
+        try:
+            results = await batch.send(list(batch.futures))
+        except Exception as exc:
+            batch.set_exception(exc)
+        else:
+            batch.set_results(results)
+
+
+class SingleFlight(object):
+    """
+    Identical requests made while one of them is in flight
+    wait for its result instead of being sent again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, function):
+        """
+        Calls function or waits for the call of the same key made by another thread.
+
+        :return: Pair (result, shared), shared is True if the result is of another call.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = function()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight(SingleFlight):
+    """Same as SingleFlight for tasks of one event loop, `function` returns a coroutine."""
+
+    async def do(self, key, function):
+        future = self._calls.get(key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+            # The task of the call was cancelled, the request is made again.
+            return await self.do(key, function)
+
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await function()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Marks the exception as retrieved if no task waits for it.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
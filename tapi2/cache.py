@@ -0,0 +1,207 @@
+from __future__ import unicode_literals
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from .utils import BUFFER_BODY_TYPES
+
+
+def _hash_body(body):
+    if body is None:
+        return None
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if not isinstance(body, BUFFER_BODY_TYPES):
+        body = repr(body).encode("utf-8")
+    return hashlib.sha1(body).hexdigest()
+
+
+def _normalize_params(params):
+    if isinstance(params, dict):
+        return sorted((str(key), repr(value)) for key, value in params.items())
+    return repr(params)
+
+
+def make_cache_key(request_method, request_kwargs, headers=()):
+    """
+    Key of request from method, url, params, hash of body
+    and values of the selected headers.
+    """
+    headers = {header.lower() for header in headers}
+    request_headers = request_kwargs.get("headers") or {}
+    selected_headers = sorted(
+        (key.lower(), str(value))
+        for key, value in request_headers.items()
+        if key.lower() in headers
+    )
+    key = (
+        request_method.upper(),
+        request_kwargs.get("url"),
+        _normalize_params(request_kwargs.get("params")),
+        _hash_body(request_kwargs.get("data")),
+        _hash_body(request_kwargs.get("json")),
+        selected_headers,
+    )
+    return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+
+
+class BaseCache(object):
+    """
+    Cache of processed responses.
+    Counts hits and misses, subclasses implement the storage.
+    """
+
+    def __init__(self, ttl=None):
+        """
+        :param ttl: Default time to live of values in seconds, None is unlimited.
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()
+
+    def _now(self):
+        return time.time()
+
+    def _expires(self, ttl):
+        ttl = self.ttl if ttl is None else ttl
+        if ttl is None:
+            return None
+        return self._now() + ttl
+
+    def _get(self, key):
+        """Returns a pair (expires, value) or None."""
+        raise NotImplementedError()
+
+    def _set(self, key, expires, value):
+        raise NotImplementedError()
+
+    def delete(self, key):
+        raise NotImplementedError()
+
+    def clear(self):
+        raise NotImplementedError()
+
+    def get_entry(self, key):
+        """
+        Returns a pair (value, is fresh) or (None, False).
+        Expired values are returned too, so that they can be revalidated
+        with conditional requests, they are removed by eviction.
+        """
+        entry = self._get(key)
+        if entry is not None:
+            expires, value = entry
+            fresh = expires is None or expires > self._now()
+        else:
+            value, fresh = None, False
+
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return value, fresh
+
+    def get(self, key):
+        value, fresh = self.get_entry(key)
+        if fresh:
+            return value
+        return None
+
+    def set(self, key, value, ttl=None):
+        self._set(key, self._expires(ttl), value)
+
+    def revalidate(self, key, value, ttl=None):
+        """Renews the value after the server has confirmed that it is not modified."""
+        with self._lock:
+            self.revalidations += 1
+        self.set(key, value, ttl=ttl)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+        }
+
+
+class MemoryCache(BaseCache):
+    """In-memory cache with LRU eviction."""
+
+    def __init__(self, maxsize=1024, ttl=None):
+        super(MemoryCache, self).__init__(ttl=ttl)
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def _now(self):
+        return time.monotonic()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def _set(self, key, expires, value):
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {**super(MemoryCache, self).stats(), "size": len(self)}
+
+
+class FileCache(BaseCache):
+    """On-disk cache, values are pickled to files of the directory."""
+
+    def __init__(self, directory, ttl=None):
+        super(FileCache, self).__init__(ttl=ttl)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pickle")
+
+    def _get(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def _set(self, key, expires, value):
+        path = self._path(key)
+        tmp_path = "{}.{}.tmp".format(path, threading.get_ident())
+        with open(tmp_path, "wb") as f:
+            pickle.dump((expires, value), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for filename in os.listdir(self.directory):
+            if filename.endswith(".pickle"):
+                os.remove(os.path.join(self.directory, filename))
@@ -0,0 +1,223 @@
+from __future__ import unicode_literals
+
+import bisect
+import threading
+import time
+
+
+def _body_size(body):
+    """Size of a request body, None for streams."""
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    try:
+        return memoryview(body).nbytes
+    except TypeError:
+        return None
+
+
+class RequestEvent(object):
+    """
+    State of a request passed to the hooks of instruments.
+    Timings of the attempt are in seconds: "prepare" (get_request_kwargs
+    and serialization), "rate_limit" (waiting for the rate limiter),
+    "send" (transport), "process" (process_response and decoding),
+    "refresh" (refresh_authentication) and "total" (since the first attempt,
+    including previous attempts and delays between them).
+    """
+
+    __slots__ = (
+        "resource_name",
+        "method",
+        "url",
+        "attempt",
+        "status_code",
+        "request_bytes",
+        "response_bytes",
+        "timings",
+        "started",
+        "marked",
+        "stream",
+        "error",
+        "delay",
+        "page",
+    )
+
+    def __init__(self, resource_name, method, attempt=1, started=None):
+        self.resource_name = resource_name
+        self.method = method
+        self.url = None
+        self.attempt = attempt
+        self.status_code = None
+        self.request_bytes = None
+        self.response_bytes = None
+        self.timings = {}
+        self.marked = time.monotonic()
+        self.started = self.marked if started is None else started
+        self.stream = False
+        self.error = None
+        self.delay = None
+        self.page = None
+
+    def mark(self, phase):
+        """Records the time of the phase since the previous one."""
+        now = time.monotonic()
+        self.timings[phase] = now - self.marked
+        self.timings["total"] = now - self.started
+        self.marked = now
+
+    def set_request(self, request_kwargs):
+        self.url = request_kwargs.get("url")
+        self.stream = bool(request_kwargs.get("stream"))
+        self.request_bytes = _body_size(request_kwargs.get("data"))
+
+    def set_response(self, response):
+        self.status_code = response.status_code
+        length = response.headers.get("Content-Length")
+        if length is not None and length.isdigit():
+            self.response_bytes = int(length)
+        elif not self.stream:
+            content = getattr(response, "content", None)
+            if content is not None:
+                self.response_bytes = len(content)
+
+    def __repr__(self):
+        return "<RequestEvent {} {} attempt={} status={}>".format(
+            self.method, self.url, self.attempt, self.status_code
+        )
+
+
+class Instrument(object):
+    """
+    Hooks of the request lifecycle, the instantiator takes a list of instruments
+    (instruments=[...]). Hooks are called in the thread (or the event loop)
+    of the request and must be fast.
+    """
+
+    def on_request_start(self, event):
+        pass
+
+    def on_response(self, event):
+        pass
+
+    def on_retry(self, event):
+        """event.delay is the number of seconds before the next attempt."""
+        pass
+
+    def on_refresh(self, event):
+        pass
+
+    def on_page(self, event):
+        """A page of iter_items or pages, event.page is its number from 1."""
+        pass
+
+    def on_error(self, event):
+        """The request failed, event.error is the exception."""
+        pass
+
+
+# Upper bounds of the latency buckets, seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram(object):
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, percent):
+        """Estimate by linear interpolation inside the bucket."""
+        if not self.count:
+            return None
+        rank = self.count * percent / 100.0
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                if index == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[index] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+class MetricsAggregator(Instrument):
+    """
+    Latency histograms and error counters by resource,
+    exported with to_dict() or to_prometheus().
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, namespace="tapi"):
+        self.buckets = buckets
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._errors = {}
+        self._retries = {}
+
+    def _histogram(self, resource_name):
+        histogram = self._histograms.get(resource_name)
+        if histogram is None:
+            histogram = self._histograms[resource_name] = LatencyHistogram(self.buckets)
+        return histogram
+
+    def on_response(self, event):
+        with self._lock:
+            self._histogram(event.resource_name).observe(event.timings["total"])
+
+    def on_retry(self, event):
+        with self._lock:
+            self._retries[event.resource_name] = self._retries.get(event.resource_name, 0) + 1
+
+    def on_error(self, event):
+        with self._lock:
+            self._histogram(event.resource_name).observe(event.timings["total"])
+            self._errors[event.resource_name] = self._errors.get(event.resource_name, 0) + 1
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                resource_name: {
+                    "count": histogram.count,
+                    "errors": self._errors.get(resource_name, 0),
+                    "retries": self._retries.get(resource_name, 0),
+                    "sum": histogram.sum,
+                    "p50": histogram.percentile(50),
+                    "p95": histogram.percentile(95),
+                    "p99": histogram.percentile(99),
+                }
+                for resource_name, histogram in self._histograms.items()
+            }
+
+    def to_prometheus(self):
+        """Metrics in the Prometheus text exposition format."""
+        name = self.namespace + "_request_duration_seconds"
+        lines = [
+            "# HELP {} Duration of requests by resource.".format(name),
+            "# TYPE {} histogram".format(name),
+        ]
+        with self._lock:
+            for resource_name, histogram in sorted(self._histograms.items(), key=lambda item: str(item[0])):
+                label = 'resource="{}"'.format(resource_name)
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append('{}_bucket{{{},le="{}"}} {}'.format(name, label, bound, cumulative))
+                lines.append("{}_sum{{{}}} {}".format(name, label, histogram.sum))
+                lines.append("{}_count{{{}}} {}".format(name, label, histogram.count))
+
+            for metric, values in (("errors", self._errors), ("retries", self._retries)):
+                metric_name = "{}_request_{}_total".format(self.namespace, metric)
+                lines.append("# TYPE {} counter".format(metric_name))
+                for resource_name, value in sorted(values.items(), key=lambda item: str(item[0])):
+                    lines.append('{}{{resource="{}"}} {}'.format(metric_name, resource_name, value))
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,95 @@
+from __future__ import unicode_literals
+
+import importlib
+import json
+
+
+class JSONBackend(object):
+    """
+    Encoder and decoder of JSON.
+    `loads` takes bytes or str, `dumps` returns bytes or str,
+    both are accepted as the body of a request.
+    """
+
+    name = None
+
+    def loads(self, data):
+        raise NotImplementedError()
+
+    def dumps(self, data):
+        raise NotImplementedError()
+
+
+class StdlibJSONBackend(JSONBackend):
+    name = "json"
+
+    def loads(self, data):
+        if isinstance(data, bytes):
+            # Decoding first is faster than the encoding detection of json.loads,
+            # it stays for bodies that are not plain UTF-8 (BOM, UTF-16).
+            try:
+                return json.loads(data.decode("utf-8"))
+            except ValueError:
+                pass
+        return json.loads(data)
+
+    def dumps(self, data):
+        return json.dumps(data)
+
+
+class UJSONBackend(JSONBackend):
+    name = "ujson"
+
+    def __init__(self):
+        self._ujson = importlib.import_module("ujson")
+
+    def loads(self, data):
+        return self._ujson.loads(data)
+
+    def dumps(self, data):
+        return self._ujson.dumps(data)
+
+
+class OrjsonBackend(JSONBackend):
+    name = "orjson"
+
+    def __init__(self):
+        self._orjson = importlib.import_module("orjson")
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+    def dumps(self, data):
+        return self._orjson.dumps(data, option=self._orjson.OPT_NON_STR_KEYS)
+
+
+# From the fastest, a backend falls back to the next one if it is not installed.
+JSON_BACKENDS = (OrjsonBackend, UJSONBackend, StdlibJSONBackend)
+
+_backends = {}
+
+
+def get_json_backend(name="json"):
+    """
+    :param name: "orjson", "ujson", "json" or "auto" (the fastest installed).
+    """
+    if isinstance(name, JSONBackend):
+        return name
+
+    names = [backend.name for backend in JSON_BACKENDS]
+    if name == "auto":
+        name = names[0]
+    if name not in names:
+        raise ValueError(
+            "Unknown JSON backend '{}', available: {}".format(name, ", ".join(names))
+        )
+
+    if name not in _backends:
+        for backend_class in JSON_BACKENDS[names.index(name) :]:
+            try:
+                _backends[name] = backend_class()
+                break
+            except ImportError:
+                continue
+
+    return _backends[name]
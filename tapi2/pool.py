@@ -0,0 +1,203 @@
+from __future__ import unicode_literals
+
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class PoolConfig(object):
+    """
+    Connection pools of the session of a client.
+
+    :param pool_connections: Number of pools (hosts) to keep.
+    :param pool_maxsize: Maximum number of connections kept open per host.
+    :param pool_block: Wait for a free connection instead of opening an extra one.
+    :param max_idle_time: Seconds after which an idle connection is closed.
+    :param max_lifetime: Seconds after which a connection is reopened.
+    """
+
+    def __init__(
+        self,
+        pool_connections=10,
+        pool_maxsize=10,
+        pool_block=False,
+        max_idle_time=None,
+        max_lifetime=None,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.max_idle_time = max_idle_time
+        self.max_lifetime = max_lifetime
+
+    def get_httpx_limits(self):
+        """The same limits for the connection pool of httpx."""
+        import httpx
+
+        return httpx.Limits(
+            max_connections=self.pool_maxsize if self.pool_block else None,
+            max_keepalive_connections=self.pool_maxsize,
+            keepalive_expiry=self.max_idle_time,
+        )
+
+
+class _PoolTracker(object):
+    """Counters of connections and expiration of idle and old connections."""
+
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.in_use = 0
+        self.reaped = 0
+
+    def is_expired(self, conn, now):
+        config = self.config
+        released = getattr(conn, "_tapi_released", None)
+        if config.max_idle_time is not None and released is not None:
+            if now - released > config.max_idle_time:
+                return True
+        if config.max_lifetime is not None:
+            return now - conn._tapi_created > config.max_lifetime
+        return False
+
+    def on_new(self, conn):
+        conn._tapi_created = time.monotonic()
+        conn._tapi_released = None
+        with self.lock:
+            self.created += 1
+
+    def on_checkout(self, conn):
+        now = time.monotonic()
+        pooled = conn._tapi_released is not None
+        if pooled and self.is_expired(conn, now):
+            conn.close()
+        # A closed connection opens a new socket on the request.
+        reopened = pooled and conn.sock is None
+        if reopened:
+            conn._tapi_created = now
+        conn._tapi_released = None
+
+        with self.lock:
+            self.in_use += 1
+            if reopened:
+                self.created += 1
+            elif pooled:
+                self.reused += 1
+
+    def on_checkin(self, conn):
+        if conn is not None:
+            conn._tapi_released = time.monotonic()
+        with self.lock:
+            self.in_use -= 1
+
+
+class _TrackedPoolMixin(object):
+    tracker = None
+
+    def _new_conn(self):
+        conn = super(_TrackedPoolMixin, self)._new_conn()
+        self.tracker.on_new(conn)
+        return conn
+
+    def _get_conn(self, timeout=None):
+        conn = super(_TrackedPoolMixin, self)._get_conn(timeout)
+        self.tracker.on_checkout(conn)
+        return conn
+
+    def _put_conn(self, conn):
+        self.tracker.on_checkin(conn)
+        super(_TrackedPoolMixin, self)._put_conn(conn)
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with expiration of connections and pool statistics."""
+
+    def __init__(self, config=None, **kwargs):
+        # HTTPAdapter has its own `config` attribute.
+        self.pool_config = config or PoolConfig()
+        self._tracker = _PoolTracker(self.pool_config)
+        super(PooledHTTPAdapter, self).__init__(
+            pool_connections=self.pool_config.pool_connections,
+            pool_maxsize=self.pool_config.pool_maxsize,
+            pool_block=self.pool_config.pool_block,
+            **kwargs
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(PooledHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type(
+                "TrackedHTTPConnectionPool",
+                (_TrackedPoolMixin, HTTPConnectionPool),
+                {"tracker": self._tracker},
+            ),
+            "https": type(
+                "TrackedHTTPSConnectionPool",
+                (_TrackedPoolMixin, HTTPSConnectionPool),
+                {"tracker": self._tracker},
+            ),
+        }
+
+    def _iter_idle_connections(self):
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None and pool.pool is not None:
+                for conn in list(pool.pool.queue):
+                    if conn is not None and conn.sock is not None:
+                        yield conn
+
+    def reap_idle_connections(self):
+        """Closes idle connections that are expired, returns their number."""
+        now = time.monotonic()
+        reaped = 0
+        for conn in self._iter_idle_connections():
+            if self._tracker.is_expired(conn, now):
+                conn.close()
+                reaped += 1
+
+        with self._tracker.lock:
+            self._tracker.reaped += reaped
+        return reaped
+
+    def stats(self):
+        tracker = self._tracker
+        return {
+            "created": tracker.created,
+            "reused": tracker.reused,
+            "in_use": tracker.in_use,
+            "idle": sum(1 for _ in self._iter_idle_connections()),
+            "reaped": tracker.reaped,
+        }
+
+
+def mount_pool(session, config):
+    adapter = PooledHTTPAdapter(config)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
+
+
+def get_pool_stats(session):
+    """Sum of the statistics of the pooled adapters of the session."""
+    stats = {"created": 0, "reused": 0, "in_use": 0, "idle": 0, "reaped": 0}
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+    for adapter in adapters.values():
+        if isinstance(adapter, PooledHTTPAdapter):
+            for name, value in adapter.stats().items():
+                stats[name] += value
+    return stats
+
+
+def reap_idle_connections(session):
+    """Closes expired idle connections of the pooled adapters of the session, returns their number."""
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+    return sum(
+        adapter.reap_idle_connections()
+        for adapter in adapters.values()
+        if isinstance(adapter, PooledHTTPAdapter)
+    )
@@ -0,0 +1,68 @@
+from __future__ import unicode_literals
+
+import threading
+import time
+
+
+class TokenBucket(object):
+    """
+    Allows `rate` requests per `per` seconds on average
+    and bursts of up to `burst` requests.
+    It is thread-safe, tokens are reserved without blocking,
+    the caller waits for the returned delay itself.
+    """
+
+    def __init__(self, rate, per=1.0, burst=None):
+        self.rate = rate
+        self.per = per
+        self.burst = rate if burst is None else burst
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self.rate / self.per
+        )
+        self._updated = now
+
+    def reserve(self, cost=1):
+        """Takes tokens and returns the number of seconds to wait before the request."""
+        with self._lock:
+            self._refill()
+            self._tokens -= cost
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens * self.per / self.rate
+
+    def update(self, remaining=None, reset_after=None, rate=None):
+        """
+        Corrects the bucket by the limits reported by the server.
+
+        :param remaining: Number of requests left in the current period.
+        :param reset_after: Seconds until the period is over,
+            it is used when no requests are left.
+        :param rate: New number of requests per period.
+        """
+        with self._lock:
+            self._refill()
+            if rate is not None:
+                self.rate = rate
+            if remaining is not None:
+                self._tokens = min(self._tokens, remaining)
+            if reset_after is not None and self._tokens <= 0:
+                self._tokens = min(self._tokens, -reset_after * self.rate / self.per)
+
+
+class RateLimiter(object):
+    """
+    Set of token buckets that all have to allow a request,
+    for example RateLimiter(TokenBucket(10), TokenBucket(1000, per=3600)).
+    """
+
+    def __init__(self, *buckets):
+        self.buckets = buckets
+
+    def reserve(self, cost=1):
+        return max([bucket.reserve(cost) for bucket in self.buckets] or [0.0])
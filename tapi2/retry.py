@@ -0,0 +1,102 @@
+from __future__ import unicode_literals
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+
+
+def _parse_retry_after(value):
+    """Seconds from the Retry-After header, which is a number or a HTTP date."""
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy(object):
+    """
+    When and after what delay a failed request is repeated.
+
+    :param max_attempts: Maximum number of attempts, including the first one.
+    :param backoff_factor: Delay before the first retry, it doubles after each attempt.
+    :param backoff_max: Maximum delay between attempts.
+    :param jitter: Random delay from zero to the backoff delay ("full jitter").
+    :param statuses: Response statuses to retry.
+    :param exceptions: Transport exceptions to retry.
+    :param deadline: Maximum seconds since the first attempt to start a retry.
+    :param respect_retry_after: Use the Retry-After header as the delay.
+    :param methods: HTTP methods to retry, by default the idempotent ones,
+        so that a write is not repeated. None retries all methods.
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        backoff_factor=0.5,
+        backoff_max=60.0,
+        jitter=True,
+        statuses=(429, 500, 502, 503, 504),
+        exceptions=(requests.ConnectionError, requests.Timeout),
+        deadline=None,
+        respect_retry_after=True,
+        methods=("GET", "HEAD", "PUT", "DELETE", "OPTIONS"),
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.exceptions = tuple(exceptions)
+        self.deadline = deadline
+        self.respect_retry_after = respect_retry_after
+        self.methods = None if methods is None else frozenset(method.upper() for method in methods)
+
+    def is_retryable(self, response=None, exception=None, request_method=None):
+        if (
+            request_method is not None
+            and self.methods is not None
+            and request_method.upper() not in self.methods
+        ):
+            return False
+        if exception is not None:
+            return isinstance(exception, self.exceptions)
+        return response is not None and response.status_code in self.statuses
+
+    def get_backoff(self, attempt):
+        delay = min(self.backoff_max, self.backoff_factor * 2 ** (attempt - 1))
+        if self.jitter:
+            return random.uniform(0, delay)
+        return delay
+
+    def get_retry_delay(
+        self, attempt, elapsed, response=None, exception=None, request_method=None
+    ):
+        """
+        Seconds to wait before the next attempt, None if the request is not repeated.
+
+        :param attempt: Number of the failed attempt, starting from 1.
+        :param elapsed: Seconds since the first attempt.
+        :param request_method: Method of the request, it is not checked if None.
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(
+            response, exception, request_method
+        ):
+            return None
+
+        delay = None
+        if self.respect_retry_after and response is not None:
+            delay = _parse_retry_after(response.headers.get("Retry-After"))
+        if delay is None:
+            delay = self.get_backoff(attempt)
+
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+        return delay
@@ -1,36 +1,98 @@
 from decimal import Decimal
 
 
+class _SerializeDispatch(dict):
+    """
+    serialize_<type name> function by type, None if the type has no method.
+    A type without its own method uses the method of the nearest base class,
+    except bool, which is not serialized as int.
+    """
+
+    def __init__(self, serializer_class):
+        super(_SerializeDispatch, self).__init__()
+        self.serializer_class = serializer_class
+
+    def __missing__(self, data_type):
+        method = None
+        for base in data_type.__mro__:
+            if base is int and data_type is bool:
+                break
+            method_name = ("serialize_" + base.__name__).lower()
+            method = getattr(self.serializer_class, method_name, None)
+            if method is not None:
+                break
+
+        self[data_type] = method
+        return method
+
+
 class BaseSerializer(object):
 
+    @classmethod
+    def _get_serialize_dispatch(cls):
+        try:
+            return cls.__dict__["_serialize_dispatch"]
+        except KeyError:
+            cls._serialize_dispatch = _SerializeDispatch(cls)
+            return cls._serialize_dispatch
+
     def deserialize(self, method_name, value, **kwargs):
         if hasattr(self, method_name):
             return getattr(self, method_name)(value, **kwargs)
         raise NotImplementedError("Desserialization method not found")
 
+    def _serialize_is_overridden(self):
+        """Values of containers go through serialize if a subclass overrides it."""
+        return type(self).serialize is not BaseSerializer.serialize
+
     def serialize_dict(self, data):
-        serialized = {}
+        """The dict is copied only if some of its values are serialized."""
+        dispatch = self._get_serialize_dispatch()
+        overridden = self._serialize_is_overridden()
+        serialized = None
 
         for key, value in data.items():
-            serialized[key] = self.serialize(value)
+            if overridden:
+                new_value = self.serialize(value)
+            else:
+                method = dispatch[type(value)]
+                if method is None:
+                    continue
+                new_value = method(self, value)
+            if new_value is not value:
+                if serialized is None:
+                    serialized = dict(data)
+                serialized[key] = new_value
 
-        return serialized
+        return data if serialized is None else serialized
 
     def serialize_list(self, data):
-        serialized = []
-        for item in data:
-            serialized.append(self.serialize(item))
+        """The list is copied only if some of its items are serialized."""
+        dispatch = self._get_serialize_dispatch()
+        overridden = self._serialize_is_overridden()
+        serialized = None
 
-        return serialized
+        for index, item in enumerate(data):
+            if overridden:
+                new_item = self.serialize(item)
+            else:
+                method = dispatch[type(item)]
+                if method is None:
+                    continue
+                new_item = method(self, item)
+            if new_item is not item:
+                if serialized is None:
+                    serialized = list(data)
+                serialized[index] = new_item
 
-    def serialize(self, data):
-        data_type = type(data).__name__
+        return data if serialized is None else serialized
 
-        serialize_method = ('serialize_' + data_type).lower()
-        if hasattr(self, serialize_method):
-            return getattr(self, serialize_method)(data)
+    def serialize(self, data):
+        method = self._get_serialize_dispatch()[type(data)]
+        if method is None:
+            return data
 
-        return data
+        return method(self, data)
 
 
 class SimpleSerializer(BaseSerializer):
@@ -0,0 +1,166 @@
+from __future__ import unicode_literals
+
+import codecs
+import itertools
+import json
+import re
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Chars after a decoded number that mean the number is not complete yet,
+# "" is the end of the buffer.
+_NUMBER_TAIL = frozenset(["", ".", "e", "E", "+", "-"] + list("0123456789"))
+
+
+class JSONStreamReader(object):
+    """
+    Decodes JSON values one by one from an iterable of byte chunks,
+    only the unparsed tail of the stream is kept in memory.
+    """
+
+    def __init__(self, chunks, encoding="utf-8"):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._json_decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read(self):
+        """Appends the next chunk to the buffer, returns False at the end of stream."""
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self.buffer = self.buffer[self.pos :] + text
+                self.pos = 0
+                return True
+
+        self.eof = True
+        return False
+
+    def peek(self):
+        """Skips whitespace and returns the next char, None at the end of stream."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read():
+                return None
+
+    def expect(self, char):
+        next_char = self.peek()
+        if next_char != char:
+            raise ValueError(
+                "Expecting '{}', got '{}' in JSON stream".format(char, next_char)
+            )
+        self.pos += 1
+
+    def decode_value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._read():
+                    continue
+                raise
+
+            # A number can continue in the next chunk: raw_decode("1.") stops at ".".
+            if (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and self.buffer[end : end + 1] in _NUMBER_TAIL
+                and not self.eof
+                and self._read()
+            ):
+                continue
+
+            self.pos = end
+            return value
+
+    def find_key(self, key):
+        """Moves into the object up to the value of the key."""
+        self.expect("{")
+        while self.peek() != "}":
+            name = self.decode_value()
+            self.expect(":")
+            if name == key:
+                return True
+
+            self.decode_value()
+            if self.peek() == ",":
+                self.pos += 1
+
+        return False
+
+    def iter_array(self):
+        self.expect("[")
+        if self.peek() == "]":
+            return
+
+        while True:
+            yield self.decode_value()
+            next_char = self.peek()
+            if next_char == "]":
+                return
+            self.expect(",")
+
+
+def iter_json_items(chunks, path=None, encoding="utf-8"):
+    """
+    Lazily yields elements of a JSON array from byte chunks.
+
+    :param path: Key or sequence of keys leading to the array,
+        None if the array is the root of the document.
+        For {"result": {"data": [...]}} it's ("result", "data").
+    """
+    reader = JSONStreamReader(chunks, encoding=encoding)
+
+    if isinstance(path, str):
+        path = (path,)
+    for key in path or ():
+        if not reader.find_key(key):
+            return
+
+    yield from reader.iter_array()
+
+
+class JSONArrayBody(object):
+    """
+    Request body of a JSON array, which is encoded by batches of records
+    and sent with chunked transfer encoding, e.g.
+    client.upload().post(data=JSONArrayBody(records_generator)).
+    """
+
+    def __init__(self, records):
+        self.records = records
+
+
+def iter_json_array_chunks(records, dumps, chunk_size=64 * 1024, batch_size=100):
+    """
+    Encodes records to a JSON array by chunks of about chunk_size bytes,
+    only a batch of records and a chunk are kept in memory.
+
+    :param dumps: Function that encodes a list of records to str or bytes.
+    """
+    chunk = bytearray(b"[")
+    separator = b""
+    records = iter(records)
+    while True:
+        batch = list(itertools.islice(records, batch_size))
+        if not batch:
+            break
+
+        value = dumps(batch)
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        # Items of the encoded list without the brackets.
+        chunk += separator
+        chunk += value[1:-1]
+        separator = b","
+
+        if len(chunk) >= chunk_size:
+            yield bytes(chunk)
+            chunk = bytearray()
+
+    chunk += b"]"
+    yield bytes(chunk)
@@ -1,37 +1,168 @@
 from __future__ import unicode_literals
 
 import copy
+import functools
 import json
+import queue
+import threading
+import time
 import webbrowser
-from collections import OrderedDict
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from pprint import pprint
 
 import requests
 
+from .batching import RequestBatcher, SingleFlight
 from .exceptions import ResponseProcessException
+from .instrumentation import RequestEvent
+from .pool import get_pool_stats, mount_pool, reap_idle_connections
+from .transports import HttpxAsyncTransport, RequestsTransport
+from .utils import is_stream_body, resource_name_aliases
+
+
+# Actions of the steps of a request, see TapiClientExecutor._request_steps.
+_SEND = "send"
+_SLEEP = "sleep"
+_RESOLVE = "resolve"
+
+
+def _parse_batch_request(request):
+    """(executor, method) or (executor, method, kwargs)"""
+    executor, method, *kwargs = request
+    return executor, method.lower(), kwargs[0] if kwargs else {}
 
 
 class TapiInstantiator(object):
     def __init__(self, adapter_class):
         self.adapter_class = adapter_class
 
-    def __call__(self, serializer_class=None, session=None, resource_mapping=None, **kwargs):
+    def __call__(
+        self,
+        serializer_class=None,
+        session=None,
+        resource_mapping=None,
+        asynchronous=False,
+        transport=None,
+        cache=None,
+        json_backend=None,
+        rate_limiter=None,
+        retry_policy=None,
+        pool=None,
+        instruments=None,
+        single_flight=False,
+        **kwargs
+    ):
+        """
+        :param json_backend: "orjson", "ujson", "json" or "auto",
+            overrides the json_backend of the adapter.
+        :param cache: Cache of processed responses, see tapi2.cache.MemoryCache.
+            Data of a cached response is shared between results, do not mutate it.
+            Expired responses having ETag or Last-Modified are revalidated
+            with conditional requests.
+        :param rate_limiter: tapi2.ratelimit.RateLimiter or TokenBucket of all requests,
+            resources can have their own with the "rate_limiter" parameter,
+            and the "rate_cost" parameter for the number of tokens of a request.
+        :param retry_policy: tapi2.retry.RetryPolicy, overrides the retry_policy of the adapter.
+        :param transport: Transport of requests, see tapi2.transports,
+            by default requests.Session (httpx for the asynchronous client).
+        :param pool: tapi2.pool.PoolConfig of the connection pools of the session
+            (or of the httpx client of the asynchronous client).
+        :param instruments: List of tapi2.instrumentation.Instrument,
+            their hooks are called on the events of requests,
+            for example tapi2.instrumentation.MetricsAggregator.
+        :param single_flight: Identical GET and HEAD requests made concurrently
+            share one request and its processed response,
+            see TapiAdapter.get_single_flight_key. Each caller gets its own result,
+            but their data is the same object, do not mutate it.
+        """
         refresh_token_default = kwargs.pop("refresh_token_by_default", False)
+        api = self.adapter_class(
+            serializer_class=serializer_class,
+            resource_mapping=resource_mapping,
+            json_backend=json_backend,
+        )
+
+        if asynchronous:
+            from .aio import AsyncTapiClient
+
+            if transport is None and pool is not None:
+                transport = HttpxAsyncTransport(limits=pool.get_httpx_limits())
+
+            return AsyncTapiClient(
+                api,
+                api_params=kwargs,
+                refresh_token_by_default=refresh_token_default,
+                transport=transport,
+                cache=cache,
+                rate_limiter=rate_limiter,
+                retry_policy=retry_policy,
+                instruments=instruments,
+                single_flight=single_flight,
+            )
+
+        if pool is not None:
+            session = session or requests.Session()
+            mount_pool(session, pool)
+
         return TapiClient(
-            self.adapter_class(
-                serializer_class=serializer_class,
-                resource_mapping=resource_mapping,
-            ),
+            api,
             api_params=kwargs,
             refresh_token_by_default=refresh_token_default,
             session=session,
+            transport=transport,
+            cache=cache,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            instruments=instruments,
+            single_flight=single_flight,
         )
 
 
+class TapiContext(
+    namedtuple(
+        "TapiContext",
+        [
+            "api",
+            "api_params",
+            "session",
+            "store",
+            "refresh_token_by_default",
+            "cache",
+            "transport",
+            "batcher",
+            "rate_limiter",
+            "retry_policy",
+            "instruments",
+            "single_flight",
+        ],
+    )
+):
+    """
+    State shared by the whole tree of clients created from one instantiation,
+    it is passed to every wrapped result as is.
+    """
+
+    __slots__ = ()
+
+
 class TapiClient(object):
+    # Many clients are created, one for every result and page.
+    __slots__ = (
+        "_tapi_context",
+        "_data",
+        "_response",
+        "_request_kwargs",
+        "_resource",
+        "_resource_name",
+        "_refresh_data",
+        "_it",
+    )
+    _single_flight_class = SingleFlight
+
     def __init__(
         self,
-        api,
+        api=None,
         data=None,
         response=None,
         request_kwargs=None,
@@ -42,20 +173,88 @@ class TapiClient(object):
         session=None,
         store=None,
         resource_name=None,
+        cache=None,
+        transport=None,
+        batcher=None,
+        rate_limiter=None,
+        retry_policy=None,
+        instruments=None,
+        single_flight=False,
+        context=None,
         *args,
         **kwargs
     ):
-        self._api = api
+        if context is None:
+            session = session or requests.Session()
+            context = TapiContext(
+                api=api,
+                api_params={} if api_params is None else api_params,
+                session=session,
+                store={} if store is None else store,
+                refresh_token_by_default=refresh_token_by_default,
+                cache=cache,
+                transport=transport or RequestsTransport(session),
+                batcher=batcher or RequestBatcher(),
+                rate_limiter=rate_limiter,
+                retry_policy=retry_policy or getattr(api, "retry_policy", None),
+                instruments=tuple(instruments or ()),
+                single_flight=self._single_flight_class() if single_flight else None,
+            )
+        self._tapi_context = context
         self._data = data
         self._response = response
-        self._api_params = api_params or {}
         self._request_kwargs = request_kwargs
         self._resource = resource
         self._resource_name = resource_name
-        self._refresh_token_default = refresh_token_by_default
         self._refresh_data = refresh_data
-        self._session = session or requests.Session()
-        self.store = store or {}
+
+    @property
+    def _api(self):
+        return self._tapi_context.api
+
+    @property
+    def _api_params(self):
+        return self._tapi_context.api_params
+
+    @property
+    def _session(self):
+        return self._tapi_context.session
+
+    @property
+    def _refresh_token_default(self):
+        return self._tapi_context.refresh_token_by_default
+
+    @property
+    def _cache(self):
+        return self._tapi_context.cache
+
+    @property
+    def _transport(self):
+        return self._tapi_context.transport
+
+    @property
+    def _rate_limiter(self):
+        return self._tapi_context.rate_limiter
+
+    @property
+    def _retry_policy(self):
+        return self._tapi_context.retry_policy
+
+    @property
+    def _instruments(self):
+        return self._tapi_context.instruments
+
+    @property
+    def _single_flight(self):
+        return self._tapi_context.single_flight
+
+    @property
+    def _batcher(self):
+        return self._tapi_context.batcher
+
+    @property
+    def store(self):
+        return self._tapi_context.store
 
     @property
     def data(self):
@@ -73,43 +272,29 @@ class TapiClient(object):
     def status_code(self):
         return self.response.status_code
 
-    def _instatiate_api(self):
-        serializer_class = None
-        if self._api.serializer:
-            serializer_class = self._api.serializer.__class__
-        return self._api.__class__(serializer_class=serializer_class)
-
     def _wrap_in_tapi(self, data, *args, **kwargs):
         request_kwargs = kwargs.pop("request_kwargs", self._request_kwargs)
         response = kwargs.pop("response", self._response)
         resource_name = kwargs.pop("resource_name", self._resource_name)
-        return TapiClient(
-            self._instatiate_api(),
+        return self._client_class(
             data=data,
-            api_params=self._api_params,
             response=response,
             request_kwargs=request_kwargs,
-            refresh_token_by_default=self._refresh_token_default,
             refresh_data=self._refresh_data,
             resource_name=resource_name,
-            session=self._session,
-            store=self.store,
+            context=self._tapi_context,
             *args,
             **kwargs
         )
 
     def _wrap_in_tapi_executor(self, data, *args, **kwargs):
         request_kwargs = kwargs.pop("request_kwargs", self._request_kwargs)
-        return TapiClientExecutor(
-            self._instatiate_api(),
+        return self._executor_class(
             data=data,
-            api_params=self._api_params,
             request_kwargs=request_kwargs,
-            refresh_token_by_default=self._refresh_token_default,
             refresh_data=self._refresh_data,
             resource_name=self._resource_name,
-            session=self._session,
-            store=self.store,
+            context=self._tapi_context,
             *args,
             **kwargs
         )
@@ -131,8 +316,9 @@ class TapiClient(object):
     def __call__(self, *args, **kwargs):
         data = self._data
 
-        url_params = self._api_params.get("default_url_params", {})
-        url_params.update(kwargs)
+        # default_url_params are shared by all calls, they are not changed.
+        default_url_params = self._api_params.get("default_url_params")
+        url_params = {**default_url_params, **kwargs} if default_url_params else kwargs
         if self._resource and url_params:
             data = self._api.fill_resource_template_url(self._data, url_params, self._resource_name)
 
@@ -140,47 +326,18 @@ class TapiClient(object):
             data, resource=self._resource, response=self._response
         )
 
-    """
-    Convert a snake_case string in CamelCase.
-    http://stackoverflow.com/questions/19053707/convert-snake-case-snake-case-to-lower-camel-case-lowercamelcase-in-python
-    """
-
-    def _to_camel_case(self, name):
-        if isinstance(name, int):
-            return name
-        components = name.split("_")
-        return components[0] + "".join(x.title() for x in components[1:])
-
-    def _get_client_from_name(self, name):
-        # if could not access, falback to resource mapping
-        resource_mapping = self._api.resource_mapping
-        if name in resource_mapping:
-            resource = resource_mapping[name]
-            api_root = self._api.get_api_root(self._api_params, resource_name=name)
-            url = api_root.rstrip("/") + "/" + resource["resource"].lstrip("/")
-            return self._wrap_in_tapi(url, resource=resource, resource_name=name)
-
-        if name in self.store:
-            return self.store[name]
-
-        return None
-
     def _get_client_from_name_or_fallback(self, name):
-        client = self._get_client_from_name(name)
-        if client is not None:
-            return client
-
-        camel_case_name = self._to_camel_case(name)
-        client = self._get_client_from_name(camel_case_name)
-        if client is not None:
-            return client
-
-        normal_camel_case_name = camel_case_name[0].upper()
-        normal_camel_case_name += camel_case_name[1:]
+        resource_name = self._api._resolve_resource_name(name)
+        if resource_name is not None:
+            resource = self._api.resource_mapping[resource_name]
+            url = self._api._get_resource_url(self._api_params, resource_name)
+            return self._wrap_in_tapi(
+                url, resource=resource, resource_name=resource_name
+            )
 
-        client = self._get_client_from_name(normal_camel_case_name)
-        if client is not None:
-            return client
+        for alias in resource_name_aliases(name):
+            if alias in self.store:
+                return self.store[alias]
 
         return None
 
@@ -239,10 +396,75 @@ class TapiClient(object):
     def __contains__(self, key):
         return key in self._data
 
+    def _run_batch(self, requests, max_workers):
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {}
+        for index, request in enumerate(requests):
+            executor, method, kwargs = _parse_batch_request(request)
+            # Submitted right away, so that all of them get into the batch.
+            future = executor._submit_to_batch(method.upper(), **kwargs)
+            if future is None:
+                future = pool.submit(getattr(executor, method), **kwargs)
+            futures[future] = index
+        pool.shutdown(wait=False)
+        return futures
+
+    def close(self):
+        self._transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def pool_stats(self):
+        """
+        Statistics of the connection pools of the session:
+        created, reused, in use, idle and reaped connections.
+        Only the pools mounted with the `pool` parameter are counted.
+        """
+        return get_pool_stats(self._session)
+
+    def reap_idle_connections(self):
+        """
+        Closes idle connections of the session that are expired
+        by max_idle_time or max_lifetime of the pool, returns their number.
+        Without it they are checked only when taken from the pool,
+        so call it periodically to release the connections of idle clients.
+        """
+        return reap_idle_connections(self._session)
+
+    def batch(self, requests, max_workers=10):
+        """
+        Executes requests concurrently over the shared session.
+
+        :param requests: Sequence of (executor, method) or (executor, method, kwargs),
+            for example [(client.user(id=1), "get", {"params": {...}}), ...].
+        :param max_workers: Maximum number of simultaneous requests.
+            The session is not changed, size its connection pools to the workers
+            with the pool parameter, for example pool=PoolConfig(pool_maxsize=20).
+        :return: List of results in the order of requests.
+            If a request fails, its exception is returned instead of the result.
+        """
+        futures = self._run_batch(requests, max_workers)
+        results = [None] * len(futures)
+        for future, index in futures.items():
+            results[index] = future.exception() or future.result()
+        return results
+
+    def iter_batch(self, requests, max_workers=10):
+        """
+        Same as batch, but yields pairs (index of request, result)
+        in the order of completion.
+        """
+        futures = self._run_batch(requests, max_workers)
+        for future in as_completed(futures):
+            yield futures[future], future.exception() or future.result()
+
 
 class TapiClientExecutor(TapiClient):
-    def __init__(self, api, *args, **kwargs):
-        super(TapiClientExecutor, self).__init__(api, *args, **kwargs)
+    __slots__ = ()
 
     def __getitem__(self, key):
         raise Exception(
@@ -253,7 +475,7 @@ class TapiClientExecutor(TapiClient):
         raise Exception("Cannot iterate over a TapiClientExecutor object")
 
     def __getattr__(self, name):
-        if name.startswith("to_") or name in self._api.native_methods:
+        if name.startswith("to_") or name in self._api._get_native_methods():
             return self._api._get_to_native_method(name, self._data, **self._context())
         raise AttributeError(name)
 
@@ -293,59 +515,391 @@ class TapiClientExecutor(TapiClient):
             **kwargs
         }
 
-    def _make_request(
-        self, request_method, refresh_token=None, repeat_number=0, *args, **kwargs
-    ):
+    def _get_request_kwargs(self, request_method, *args, **kwargs):
         if "url" not in kwargs:
             kwargs["url"] = self._data
 
-        request_kwargs = self._api.get_request_kwargs(
+        return self._api.get_request_kwargs(
             self._api_params, request_method, *args, **kwargs
         )
 
-        response_data = None
-        response = self._session.request(request_method, **request_kwargs)
-        try:
-            response_data = self._api.process_response(
+    def _get_cache_key(self, request_method, request_kwargs):
+        if self._cache is None or request_kwargs.get("stream"):
+            return None
+        return self._api.get_cache_key(
+            request_method,
+            resource=self._resource,
+            **self._context(request_kwargs=request_kwargs)
+        )
+
+    def _get_from_cache(self, cache_key):
+        """Returns a pair ((response_data, response), is fresh)."""
+        if cache_key is None:
+            return None, False
+        return self._cache.get_entry(cache_key)
+
+    def _wrap_cached(self, cached, request_kwargs):
+        response_data, response = cached
+        return self._wrap_in_tapi(
+            response_data, response=response, request_kwargs=request_kwargs
+        )
+
+    def _set_to_cache(self, cache_key, response_data, response):
+        if cache_key is not None:
+            ttl = (self._resource or {}).get("cache_ttl")
+            self._cache.set(cache_key, (response_data, response), ttl=ttl)
+
+    def _get_conditional_request_kwargs(self, request_kwargs, cached):
+        """Adds validators of the cached response to the request headers."""
+        if cached is None:
+            return request_kwargs
+
+        _, cached_response = cached
+        headers = {}
+        etag = cached_response.headers.get("ETag")
+        if etag:
+            headers["If-None-Match"] = etag
+        last_modified = cached_response.headers.get("Last-Modified")
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        if not headers:
+            return request_kwargs
+        return {
+            **request_kwargs,
+            "headers": {**(request_kwargs.get("headers") or {}), **headers},
+        }
+
+    def _is_not_modified(self, cache_key, cached, response):
+        if cached is None or response.status_code != 304:
+            return False
+
+        ttl = (self._resource or {}).get("cache_ttl")
+        self._cache.revalidate(cache_key, cached, ttl=ttl)
+        return True
+
+    def _get_rate_limiters(self):
+        resource_limiter = (self._resource or {}).get("rate_limiter")
+        return [
+            limiter
+            for limiter in (self._rate_limiter, resource_limiter)
+            if limiter is not None
+        ]
+
+    def _get_rate_limit_delay(self, rate_limiters):
+        """Takes tokens of the request and returns seconds to wait before sending it."""
+        cost = (self._resource or {}).get("rate_cost", 1)
+        return max(limiter.reserve(cost) for limiter in rate_limiters)
+
+    def _update_rate_limits(self, rate_limiters, response, request_kwargs):
+        for limiter in rate_limiters:
+            self._api.update_rate_limit(
+                limiter,
+                resource=self._resource,
                 **self._context(response=response, request_kwargs=request_kwargs)
             )
-        except ResponseProcessException as e:
-            repeat_number += 1
-            client = self._wrap_in_tapi(
-                e.data, response=response, request_kwargs=request_kwargs
-            )
-            context = self._context(response=response, request_kwargs=request_kwargs, client=client)
-            error_message = self._api.get_error_message(data=e.data, response=response)
-            tapi_exception = e.tapi_exception(message=error_message, client=client)
 
-            should_refresh_token = (
-                refresh_token is not False and self._refresh_token_default
-            )
-            auth_expired = self._api.is_authentication_expired(tapi_exception, **context)
-
-            if should_refresh_token and auth_expired:
-                self._refresh_data = self._api.refresh_authentication(**context)
-                if self._refresh_data:
-                    return self._make_request(
-                        request_method,
-                        refresh_token=False,
-                        repeat_number=repeat_number,
-                        *args, **kwargs
-                    )
+    def _get_retry_delay(
+        self, request_method, repeat_number, started, request_kwargs, **kwargs
+    ):
+        """
+        Seconds to wait before repeating the request by the retry policy,
+        None if it should not be repeated. Stream bodies can not be sent twice.
+        """
+        policy = self._retry_policy
+        if policy is None or is_stream_body(request_kwargs.get("data")):
+            return None
+        return policy.get_retry_delay(
+            repeat_number,
+            time.monotonic() - started,
+            request_method=request_method,
+            **kwargs
+        )
+
+    def _emit(self, hook, event):
+        for instrument in self._instruments:
+            getattr(instrument, hook)(event)
+
+    def _get_page_event(self, page):
+        """Event of the executor of a page, pages are numbered from 1."""
+        request = getattr(self._response, "request", None)
+        event = RequestEvent(self._resource_name, getattr(request, "method", None))
+        event.page = page
+        if self._request_kwargs:
+            event.set_request(self._request_kwargs)
+        if self._response is not None:
+            event.set_response(self._response)
+        return event
+
+    def _process_response(self, response, request_kwargs):
+        return self._api.process_response(
+            **self._context(response=response, request_kwargs=request_kwargs)
+        )
+
+    def _get_error_context(self, exception, response, request_kwargs):
+        """Wraps ResponseProcessException into tapi exception and its context."""
+        client = self._wrap_in_tapi(
+            exception.data, response=response, request_kwargs=request_kwargs
+        )
+        context = self._context(
+            response=response, request_kwargs=request_kwargs, client=client
+        )
+        error_message = self._api.get_error_message(
+            data=exception.data, response=response
+        )
+        tapi_exception = exception.tapi_exception(message=error_message, client=client)
+        return tapi_exception, error_message, context
+
+    def _should_refresh_token(self, refresh_token, tapi_exception, context):
+        should_refresh_token = refresh_token is not False and self._refresh_token_default
+        return should_refresh_token and self._api.is_authentication_expired(
+            tapi_exception, **context
+        )
+
+    def _submit_to_batch(
+        self, request_method, refresh_token=None, repeat_number=0, *args, **kwargs
+    ):
+        """Future of the result if the request is coalesced with others, otherwise None."""
+        batch_key = self._get_batch_key(request_method, **kwargs)
+        if batch_key is None:
+            return None
+
+        group, key = batch_key
+        resource = self._resource
+        return self._batcher.submit(
+            group,
+            key,
+            functools.partial(
+                self._send_batch, request_method, {"url": self._data, **kwargs}
+            ),
+            resource.get("max_batch", self._api.max_batch),
+            resource.get("batch_window", self._api.batch_window),
+        )
+
+    def _get_batch_key(self, request_method, **kwargs):
+        """Pair (group, key) of the request, None if it is not batched."""
+        resource = self._resource
+        if not resource or not resource.get("batch_param"):
+            return None
+        return self._api.get_batch_key(
+            request_method,
+            resource=resource,
+            **self._context(request_kwargs={"url": self._data, **kwargs})
+        )
+
+    def _get_batch_request_kwargs(self, request_kwargs, keys):
+        return self._api.get_batch_request_kwargs(
+            keys=keys,
+            resource=self._resource,
+            **self._context(request_kwargs=request_kwargs)
+        )
+
+    def _split_batch_response(self, result, keys):
+        """Results of a batch request for each of the keys."""
+        executor = result()
+        data = self._api.split_batch_response(
+            response_data=executor.data,
+            keys=keys,
+            resource=self._resource,
+            **executor._context()
+        )
+        return [result._wrap_in_tapi(item) for item in data]
 
-            if self._api.retry_request(tapi_exception, error_message, repeat_number, **context):
-                return self._make_request(
+    def _send_batch(self, request_method, request_kwargs, keys):
+        result = self._send_request(
+            request_method, **self._get_batch_request_kwargs(request_kwargs, keys)
+        )
+        return self._split_batch_response(result, keys)
+
+    def _get_single_flight_key(self, request_method, **kwargs):
+        """Key of the request in the single flight, None if it is not shared."""
+        if self._single_flight is None:
+            return None
+        return self._api.get_single_flight_key(
+            request_method,
+            resource=self._resource,
+            **self._context(request_kwargs={"url": self._data, **kwargs})
+        )
+
+    def _make_request(
+        self, request_method, refresh_token=None, repeat_number=0, *args, **kwargs
+    ):
+        if (self._resource or {}).get("batch_threads"):
+            future = self._submit_to_batch(request_method, *args, **kwargs)
+            if future is not None:
+                return future.result()
+        else:
+            batch_key = self._get_batch_key(request_method, **kwargs)
+            if batch_key is not None:
+                # Sent right away as a batch of one key, batch() coalesces requests.
+                return self._send_batch(
+                    request_method, {"url": self._data, **kwargs}, [batch_key[1]]
+                )[0]
+
+        key = self._get_single_flight_key(request_method, **kwargs)
+        if key is not None:
+            result, shared = self._single_flight.do(
+                key,
+                functools.partial(
+                    self._send_request,
                     request_method,
-                    refresh_token=False,
-                    repeat_number=repeat_number,
-                    *args, **kwargs
+                    refresh_token,
+                    repeat_number,
+                    *args,
+                    **kwargs
+                ),
+            )
+            # Callers waiting for the request get their own clients.
+            return result._wrap_in_tapi(result._data) if shared else result
+
+        return self._send_request(
+            request_method, refresh_token, repeat_number, *args, **kwargs
+        )
+
+    def _request_steps(
+        self, request_method, refresh_token=None, repeat_number=0, *args, **kwargs
+    ):
+        """
+        Steps of a request, shared by the synchronous and asynchronous executors.
+        The generator yields pairs (action, argument) which the executor performs:
+        (_SEND, request_kwargs) sends the request and sends back the response
+        or throws the exception of the transport, (_SLEEP, seconds) waits,
+        (_RESOLVE, value) sends back the value of a hook, awaited if needed.
+        The result of the request is the return value of the generator.
+        """
+        started = time.monotonic()
+        # Events are created only if there are instruments.
+        instruments = self._instruments
+        event = None
+        while True:
+            if instruments:
+                event = RequestEvent(
+                    self._resource_name, request_method, repeat_number + 1, started
+                )
+            request_kwargs = self._get_request_kwargs(request_method, *args, **kwargs)
+            cache_key = self._get_cache_key(request_method, request_kwargs)
+            cached, fresh = self._get_from_cache(cache_key)
+            if fresh:
+                return self._wrap_cached(cached, request_kwargs)
+            request_kwargs = self._get_conditional_request_kwargs(request_kwargs, cached)
+            if event is not None:
+                event.set_request(request_kwargs)
+                event.mark("prepare")
+                self._emit("on_request_start", event)
+
+            response_data = None
+            rate_limiters = self._get_rate_limiters()
+            if rate_limiters:
+                delay = self._get_rate_limit_delay(rate_limiters)
+                if delay:
+                    yield _SLEEP, delay
+                    if event is not None:
+                        event.mark("rate_limit")
+            try:
+                response = yield _SEND, request_kwargs
+            except Exception as exc:
+                repeat_number += 1
+                delay = self._get_retry_delay(
+                    request_method, repeat_number, started, request_kwargs, exception=exc
+                )
+                if event is not None:
+                    event.mark("send")
+                    event.error = exc
+                    event.delay = delay
+                    self._emit("on_error" if delay is None else "on_retry", event)
+                if delay is None:
+                    raise
+                yield _SLEEP, delay
+                continue
+            if event is not None:
+                event.mark("send")
+            if rate_limiters:
+                self._update_rate_limits(rate_limiters, response, request_kwargs)
+            if self._is_not_modified(cache_key, cached, response):
+                if event is not None:
+                    event.set_response(response)
+                    self._emit("on_response", event)
+                return self._wrap_cached(cached, request_kwargs)
+
+            try:
+                response_data = self._process_response(response, request_kwargs)
+                self._set_to_cache(cache_key, response_data, response)
+            except ResponseProcessException as e:
+                repeat_number += 1
+                tapi_exception, error_message, context = self._get_error_context(
+                    e, response, request_kwargs
+                )
+                if event is not None:
+                    event.mark("process")
+                    event.set_response(response)
+                    event.error = tapi_exception
+
+                if self._should_refresh_token(refresh_token, tapi_exception, context):
+                    self._refresh_data = yield _RESOLVE, self._api.refresh_authentication(
+                        **context
+                    )
+                    if event is not None:
+                        event.mark("refresh")
+                        self._emit("on_refresh", event)
+                    if self._refresh_data:
+                        # A stream body is already read, it can not be sent again.
+                        if is_stream_body(request_kwargs.get("data")):
+                            raise tapi_exception
+                        refresh_token = False
+                        continue
+
+                delay = self._get_retry_delay(
+                    request_method, repeat_number, started, request_kwargs, response=response
                 )
+                retry = yield _RESOLVE, self._api.retry_request(
+                    tapi_exception,
+                    error_message,
+                    repeat_number,
+                    retry=delay is not None,
+                    **context
+                )
+                if retry:
+                    if is_stream_body(request_kwargs.get("data")):
+                        raise tapi_exception
+                    if event is not None:
+                        event.delay = delay
+                        self._emit("on_retry", event)
+                    refresh_token = False
+                    if delay:
+                        yield _SLEEP, delay
+                    continue
+
+                if event is not None:
+                    self._emit("on_error", event)
+                self._api.error_handling(tapi_exception, error_message, repeat_number, **context)
+            else:
+                if event is not None:
+                    event.mark("process")
+                    event.set_response(response)
+                    self._emit("on_response", event)
 
-            self._api.error_handling(tapi_exception, error_message, repeat_number, **context)
+            return self._wrap_in_tapi(
+                response_data, response=response, request_kwargs=request_kwargs
+            )
 
-        return self._wrap_in_tapi(
-            response_data, response=response, request_kwargs=request_kwargs
-        )
+    def _send_request(self, request_method, *args, **kwargs):
+        steps = self._request_steps(request_method, *args, **kwargs)
+        try:
+            action, argument = next(steps)
+            while True:
+                if action is _SEND:
+                    try:
+                        value = self._transport.send(request_method, **argument)
+                    except Exception as exc:
+                        action, argument = steps.throw(exc)
+                        continue
+                elif action is _SLEEP:
+                    value = time.sleep(argument)
+                else:
+                    value = argument
+                action, argument = steps.send(value)
+        except StopIteration as stop:
+            return stop.value
 
     def get(self, *args, **kwargs):
         return self._make_request("GET", *args, **kwargs)
@@ -365,22 +919,41 @@ class TapiClientExecutor(TapiClient):
     def delete(self, *args, **kwargs):
         return self._make_request("DELETE", *args, **kwargs)
 
+    def _is_streamed(self):
+        """Data of streamed response is a lazy iterable of records."""
+        return bool(self._request_kwargs and self._request_kwargs.get("stream"))
+
     def _get_iterator_next_request_kwargs(self):
+        if self._is_streamed():
+            return None
         return self._api.get_iterator_next_request_kwargs(
             response_data=self._data, **self._context()
         )
 
+    def _get_iterator_all_page_request_kwargs(self):
+        if self._is_streamed():
+            return None
+        return self._api.get_iterator_all_page_request_kwargs(
+            response_data=self._data, **self._context()
+        )
+
     def _get_iterator_iteritems(self):
+        if self._is_streamed():
+            return self._data
         return self._api.get_iterator_iteritems(
             response_data=self._data, **self._context()
         )
 
     def _get_iterator_pages(self):
+        if self._is_streamed():
+            return self._data
         return self._api.get_iterator_pages(
             response_data=self._data, **self._context()
         )
 
     def _get_iterator_items(self):
+        if self._is_streamed():
+            return self._data
         return self._api.get_iterator_items(
             data=self._data, **self._context()
         )
@@ -390,14 +963,186 @@ class TapiClientExecutor(TapiClient):
         reached_item_limit = max_items is not None and max_items <= item_count
         return reached_page_limit or reached_item_limit
 
-    def iter_items(self, max_pages=None, max_items=None):
+    def _request_next_page(self, executor):
+        next_request_kwargs = executor._get_iterator_next_request_kwargs()
+        if not next_request_kwargs:
+            return None
+
+        request_method = executor._response.request.method.lower()
+        method = getattr(self, request_method)
+        response = method(**next_request_kwargs)
+        return response()
+
+    def _iter_executors(self, *args, **kwargs):
+        executors = self._iter_page_executors(*args, **kwargs)
+        if self._instruments:
+            return self._instrument_pages(executors)
+        return executors
+
+    def _instrument_pages(self, executors):
+        try:
+            for page, executor in enumerate(executors, 1):
+                self._emit("on_page", executor._get_page_event(page))
+                yield executor
+        finally:
+            executors.close()
+
+    def _iter_page_executors(
+        self, max_requests=None, prefetch=None, concurrency=None, ordered=True
+    ):
+        """Yields executors of the current and next pages."""
+        all_page_request_kwargs = self._get_iterator_all_page_request_kwargs()
+        if all_page_request_kwargs is not None:
+            yield from self._iter_known_executors(
+                all_page_request_kwargs,
+                max_requests,
+                concurrency or prefetch,
+                ordered,
+            )
+            return
+
+        if prefetch:
+            yield from self._iter_prefetched_executors(max_requests, prefetch)
+            return
+
         executor = self
-        iterator_list = executor._get_iterator_iteritems()
+        request_count = 1
+        while executor is not None:
+            yield executor
+            if self._reached_max_limits(request_count, None, max_requests, None):
+                break
+            executor = self._request_next_page(executor)
+            request_count += 1
+
+    def _iter_known_executors(
+        self, all_page_request_kwargs, max_requests, concurrency, ordered
+    ):
+        """
+        Pages known in advance are requested concurrently,
+        no more than `concurrency` requests at a time.
+        """
+        yield self
+
+        request_kwargs_list = list(all_page_request_kwargs)
+        if max_requests is not None:
+            request_kwargs_list = request_kwargs_list[: max(max_requests - 1, 0)]
+
+        request_method = self._response.request.method.lower()
+        method = getattr(self, request_method)
+        url = self._request_kwargs["url"]
+
+        def request_page(request_kwargs):
+            return method(**{"url": url, **request_kwargs})()
+
+        if not concurrency or concurrency <= 1:
+            for request_kwargs in request_kwargs_list:
+                yield request_page(request_kwargs)
+            return
+
+        request_kwargs_iter = iter(request_kwargs_list)
+        pool = ThreadPoolExecutor(max_workers=concurrency)
+        pending = deque()
+
+        def submit():
+            while len(pending) < concurrency:
+                request_kwargs = next(request_kwargs_iter, None)
+                if request_kwargs is None:
+                    break
+                pending.append(pool.submit(request_page, request_kwargs))
+
+        try:
+            submit()
+            while pending:
+                if ordered:
+                    done = [pending.popleft()]
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.remove(future)
+
+                for future in done:
+                    executor = future.result()
+                    submit()
+                    yield executor
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=False)
+
+    def _iter_prefetched_executors(self, max_requests, prefetch):
+        """
+        Next pages are requested in the background thread,
+        no more than `prefetch` pages ahead of the consumed one.
+        """
+        results = queue.Queue()
+        slots = threading.Semaphore(prefetch)
+        stop = threading.Event()
+
+        def acquire_slot():
+            while not stop.is_set():
+                if slots.acquire(timeout=0.1):
+                    return not stop.is_set()
+            return False
+
+        def produce():
+            executor = self
+            request_count = 1
+            try:
+                while not self._reached_max_limits(
+                    request_count, None, max_requests, None
+                ):
+                    if not acquire_slot():
+                        return
+                    executor = self._request_next_page(executor)
+                    if executor is None:
+                        break
+                    results.put(executor)
+                    request_count += 1
+            except Exception as exc:
+                results.put(exc)
+            finally:
+                results.put(None)
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        try:
+            yield self
+            while True:
+                executor = results.get()
+                if executor is None:
+                    break
+                if isinstance(executor, Exception):
+                    raise executor
+                slots.release()
+                yield executor
+        finally:
+            stop.set()
+
+    def iter_items(
+        self,
+        max_pages=None,
+        max_items=None,
+        prefetch=None,
+        concurrency=None,
+        ordered=True,
+    ):
+        """
+        :param prefetch: Number of next pages which are requested
+            in the background while items of the current page are consumed.
+        :param concurrency: Number of simultaneous requests of pages
+            which are known in advance (see get_iterator_all_page_request_kwargs).
+        :param ordered: Yield such pages in their order, otherwise as they arrive.
+        """
         page_count = 0
         item_count = 0
 
-        while iterator_list:
-            if self._reached_max_limits(page_count, item_count, max_pages, max_items):
+        for executor in self._iter_executors(
+            max_pages, prefetch, concurrency, ordered
+        ):
+            iterator_list = executor._get_iterator_iteritems()
+            if not iterator_list or self._reached_max_limits(
+                page_count, item_count, max_pages, max_items
+            ):
                 break
 
             for item in iterator_list:
@@ -410,23 +1155,23 @@ class TapiClientExecutor(TapiClient):
 
             page_count += 1
 
-            next_request_kwargs = executor._get_iterator_next_request_kwargs()
+    def pages(self, max_pages=None, prefetch=None, concurrency=None, ordered=True):
+        """
+        :param prefetch: Number of next pages which are requested
+            in the background while the current page is consumed.
+        :param concurrency: Number of simultaneous requests of pages
+            which are known in advance (see get_iterator_all_page_request_kwargs).
+        :param ordered: Yield such pages in their order, otherwise as they arrive.
+        """
+        page_count = 0
 
-            if not next_request_kwargs:
+        for executor in self._iter_executors(
+            prefetch=prefetch, concurrency=concurrency, ordered=ordered
+        ):
+            pages = executor._get_iterator_pages()
+            if not pages:
                 break
 
-            request_method = executor._response.request.method.lower()
-            method = getattr(self, request_method)
-            response = method(**next_request_kwargs)
-            executor = response()
-            iterator_list = executor._get_iterator_iteritems()
-
-    def pages(self, max_pages=None):
-        executor = self
-        pages = executor._get_iterator_pages()
-        page_count = 0
-
-        while pages:
             for page in pages:
                 if self._reached_max_limits(page_count, None, max_pages, None):
                     break
@@ -435,19 +1180,9 @@ class TapiClientExecutor(TapiClient):
 
                 page_count += 1
 
-            next_request_kwargs = executor._get_iterator_next_request_kwargs()
-
-            if not next_request_kwargs or self._reached_max_limits(
-                page_count, None, max_pages, None
-            ):
+            if self._reached_max_limits(page_count, None, max_pages, None):
                 break
 
-            request_method = executor._response.request.method.lower()
-            method = getattr(self, request_method)
-            response = method(**next_request_kwargs)
-            executor = response()
-            pages = executor._get_iterator_pages()
-
     def items(self, max_items=None):
         items = self._get_iterator_items()
         item_count = 0
@@ -494,7 +1229,14 @@ class TapiClientExecutor(TapiClient):
         methods = [
             m for m in TapiClientExecutor.__dict__.keys() if not m.startswith("_")
         ]
-        methods += [m for m in dir(self._api.serializer) if m.startswith("to_")]
-        methods += self._api.native_methods
+        methods += [
+            m for m in type(self).__dict__.keys() if not m.startswith("_")
+        ]
+        methods += list(self._api._serializer_methods)
+        methods += sorted(self._api.native_methods)
 
         return methods
+
+
+TapiClient._client_class = TapiClient
+TapiClient._executor_class = TapiClientExecutor
@@ -0,0 +1,374 @@
+from __future__ import unicode_literals
+
+import json
+from collections import deque
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .utils import BUFFER_BODY_TYPES, is_stream_body
+
+BODY_CHUNK_SIZE = 64 * 1024
+
+
+async def _aiter_body(data, chunk_size=BODY_CHUNK_SIZE):
+    """Chunks of a bytes-like, file-like or (async) iterator body."""
+    if hasattr(data, "__aiter__"):
+        async for chunk in data:
+            yield chunk
+    elif hasattr(data, "read"):
+        while True:
+            chunk = data.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    elif isinstance(data, BUFFER_BODY_TYPES):
+        view = memoryview(data).cast("B")
+        for start in range(0, len(view), chunk_size):
+            yield bytes(view[start : start + chunk_size])
+    else:
+        for chunk in data:
+            yield chunk
+
+
+class Transport(object):
+    """
+    Interface of the transport of the client.
+    `send` receives the same arguments as `requests.Session.request`
+    and returns a `requests.Response` or an object with the same attributes
+    (status_code, content, text, headers, encoding, iter_content, request.method).
+    Transports that take verify, cert and proxies from their own client
+    raise TypeError when these arguments are set per request.
+    """
+
+    def send(self, request_method, **request_kwargs):
+        raise NotImplementedError()
+
+    def close(self):
+        pass
+
+
+class RequestsTransport(Transport):
+    """Sends requests with requests.Session, it is the default transport."""
+
+    def __init__(self, session=None):
+        self.session = session or requests.Session()
+
+    def send(self, request_method, **request_kwargs):
+        return self.session.request(request_method, **request_kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+# Arguments of requests.Session.request that the other transports take
+# from their client, with the values that do not change anything.
+_CLIENT_ARGUMENTS = {"verify": (None, True), "cert": (None,), "proxies": (None, {})}
+
+
+def _pop_client_arguments(transport, kwargs):
+    """Removes the client arguments from kwargs, raises TypeError if they are set."""
+    for name, defaults in _CLIENT_ARGUMENTS.items():
+        if kwargs.pop(name, None) not in defaults:
+            raise TypeError(
+                "{} does not support the '{}' argument per request, "
+                "set it on the client of the transport".format(
+                    type(transport).__name__, name
+                )
+            )
+
+
+def _prepare(request_method, url, **kwargs):
+    return requests.Request(
+        method=request_method.upper(),
+        url=url,
+        headers=kwargs.get("headers"),
+        files=kwargs.get("files"),
+        data=kwargs.get("data"),
+        json=kwargs.get("json"),
+        params=kwargs.get("params"),
+        auth=kwargs.get("auth"),
+        cookies=kwargs.get("cookies"),
+    ).prepare()
+
+
+class Urllib3Transport(Transport):
+    """
+    Sends requests with an urllib3 PoolManager directly,
+    without the session layer of requests (environment settings,
+    cookies persistence, hooks, adapters). Requests are still prepared
+    by requests, so params, data, json and auth work the same way.
+    """
+
+    def __init__(self, pool_manager=None, **pool_kwargs):
+        import urllib3
+
+        self._urllib3 = urllib3
+        self.pool_manager = pool_manager or urllib3.PoolManager(**pool_kwargs)
+
+    def send(
+        self,
+        request_method,
+        url,
+        timeout=None,
+        allow_redirects=True,
+        stream=False,
+        **kwargs
+    ):
+        _pop_client_arguments(self, kwargs)
+        urllib3 = self._urllib3
+        request = _prepare(request_method, url, **kwargs)
+        if isinstance(timeout, tuple):
+            timeout = urllib3.Timeout(connect=timeout[0], read=timeout[1])
+
+        try:
+            raw = self.pool_manager.urlopen(
+                request.method,
+                request.url,
+                body=request.body,
+                headers=request.headers,
+                redirect=allow_redirects,
+                retries=False,
+                timeout=timeout if timeout is not None else urllib3.Timeout.DEFAULT_TIMEOUT,
+                preload_content=not stream,
+                chunked=request.body is not None
+                and "Content-Length" not in request.headers,
+            )
+        # Errors are raised as the exceptions of requests, which retry policies know.
+        except urllib3.exceptions.NewConnectionError as exc:
+            raise requests.ConnectionError(exc, request=request)
+        except urllib3.exceptions.TimeoutError as exc:
+            raise requests.Timeout(exc, request=request)
+        except urllib3.exceptions.HTTPError as exc:
+            raise requests.ConnectionError(exc, request=request)
+
+        response = requests.Response()
+        response.status_code = raw.status
+        response.headers = CaseInsensitiveDict(raw.headers)
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.reason = raw.reason
+        response.url = raw.geturl() or request.url
+        response.request = request
+        response.raw = raw
+        if not stream:
+            response._content = raw.data
+            response._content_consumed = True
+        return response
+
+    def close(self):
+        self.pool_manager.clear()
+
+
+def _from_httpx_response(raw):
+    """Converts a read httpx.Response to `requests.Response`."""
+    request = requests.Request(method=raw.request.method, url=str(raw.request.url)).prepare()
+    response = build_response(request, raw.status_code, raw.headers, raw.content)
+    response.encoding = raw.encoding
+    response.reason = raw.reason_phrase
+    return response
+
+
+class HttpxTransport(Transport):
+    """
+    Sends requests with httpx.Client, with http2=True requests
+    to the same host are multiplexed over one connection
+    (it requires the "h2" package). Responses are read in full
+    and converted to `requests.Response`.
+    """
+
+    def __init__(self, client=None, **client_kwargs):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "HttpxTransport requires httpx, install it with "
+                "'pip install tapi-wrapper2[async]'"
+            )
+
+        self._httpx = httpx
+        self.client = client or httpx.Client(**client_kwargs)
+
+    def send(self, request_method, url, data=None, allow_redirects=True, **kwargs):
+        kwargs.pop("stream", None)
+        _pop_client_arguments(self, kwargs)
+        if isinstance(data, (str, bytes)) or is_stream_body(data):
+            kwargs["content"] = data
+        elif isinstance(data, BUFFER_BODY_TYPES):
+            kwargs["content"] = bytes(data)
+        elif data is not None:
+            kwargs["data"] = data
+
+        try:
+            raw = self.client.request(
+                request_method, url, follow_redirects=allow_redirects, **kwargs
+            )
+        except self._httpx.TimeoutException as exc:
+            raise requests.Timeout(exc)
+        except self._httpx.TransportError as exc:
+            raise requests.ConnectionError(exc)
+
+        return _from_httpx_response(raw)
+
+    def close(self):
+        self.client.close()
+
+
+class AsyncTransport(object):
+    """
+    Interface of the asynchronous transport.
+    `send` receives the same arguments as `requests.Session.request`
+    and returns the same response objects as Transport.send.
+    """
+
+    async def send(self, request_method, **request_kwargs):
+        raise NotImplementedError()
+
+    async def close(self):
+        pass
+
+
+class HttpxAsyncTransport(AsyncTransport):
+    """
+    Sends requests with httpx.AsyncClient, it is the default asynchronous transport.
+    Responses are read in full and converted to `requests.Response`.
+    """
+
+    def __init__(self, client=None, **client_kwargs):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "HttpxAsyncTransport requires httpx, install it with "
+                "'pip install tapi-wrapper2[async]'"
+            )
+
+        self._httpx = httpx
+        self.client = client or httpx.AsyncClient(**client_kwargs)
+
+    async def send(
+        self, request_method, url, data=None, allow_redirects=True, **kwargs
+    ):
+        # requests compatible arguments.
+        kwargs.pop("stream", None)
+        _pop_client_arguments(self, kwargs)
+        if isinstance(data, (str, bytes)):
+            kwargs["content"] = data
+        elif isinstance(data, BUFFER_BODY_TYPES):
+            # Sent in chunks, so that the buffer is not copied as a whole.
+            kwargs["headers"] = {
+                **(kwargs.get("headers") or {}),
+                "Content-Length": str(memoryview(data).nbytes),
+            }
+            kwargs["content"] = _aiter_body(data)
+        elif is_stream_body(data):
+            kwargs["content"] = _aiter_body(data)
+        elif data is not None:
+            kwargs["data"] = data
+
+        # Errors are raised as the exceptions of requests, which retry policies know.
+        try:
+            raw = await self.client.request(
+                request_method, url, follow_redirects=allow_redirects, **kwargs
+            )
+        except self._httpx.TimeoutException as exc:
+            raise requests.Timeout(exc)
+        except self._httpx.TransportError as exc:
+            raise requests.ConnectionError(exc)
+        return _from_httpx_response(raw)
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def _strip_query(url):
+    scheme, netloc, path, _, _ = urlsplit(url)
+    return urlunsplit((scheme, netloc, path, "", ""))
+
+
+def build_response(request, status=200, headers=None, body=b""):
+    """Make a `requests.Response` for a prepared request without network."""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers or {})
+    response._content = body
+    response._content_consumed = True
+    response.encoding = "utf-8"
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class MemoryRouter(object):
+    """
+    Routes of the in-process transports.
+    Registered responses are matched by method and url without query string.
+    When several responses are registered for the same url,
+    they are returned in turn, the last one is repeated.
+    The last max_calls pairs (request, response) are kept in calls,
+    max_calls=0 disables the recording, None keeps all of them.
+    """
+
+    def __init__(self, max_calls=100):
+        self.routes = []
+        self.calls = deque(maxlen=max_calls)
+
+    def add(
+        self,
+        method,
+        url,
+        body="",
+        status=200,
+        headers=None,
+        content_type="application/json",
+        callback=None,
+    ):
+        """
+        :param callback: Function that takes a prepared request
+            and returns a tuple (status, headers, body).
+        """
+        headers = {"Content-Type": content_type, **(headers or {})}
+        self.routes.append(
+            (method.upper(), _strip_query(url), status, headers, body, callback)
+        )
+
+    def add_json(self, method, url, data, **kwargs):
+        self.add(method, url, body=json.dumps(data), **kwargs)
+
+    def _match(self, method, url):
+        url = _strip_query(url)
+        matches = [route for route in self.routes if route[:2] == (method, url)]
+        if not matches:
+            raise requests.ConnectionError(
+                "No response registered for {} {}".format(method, url)
+            )
+        if len(matches) > 1:
+            self.routes.remove(matches[0])
+        return matches[0]
+
+    def _respond(self, request_method, url, **kwargs):
+        request = _prepare(request_method, url, **kwargs)
+        _, _, status, headers, body, callback = self._match(request.method, url)
+        if callback is not None:
+            status, headers, body = callback(request)
+
+        response = build_response(request, status, headers, body)
+        self.calls.append((request, response))
+        return response
+
+
+class MemoryTransport(MemoryRouter, Transport):
+    """In-process transport for tests and benchmarks."""
+
+    def send(self, request_method, url, **kwargs):
+        return self._respond(request_method, url, **kwargs)
+
+
+class AsyncMemoryTransport(MemoryRouter, AsyncTransport):
+    """In-process asynchronous transport for tests."""
+
+    async def send(self, request_method, url, **kwargs):
+        return self._respond(request_method, url, **kwargs)
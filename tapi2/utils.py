@@ -0,0 +1,99 @@
+import functools
+import mmap
+import re
+import string
+from collections.abc import AsyncIterator, Iterator
+from urllib.parse import quote
+
+
+def to_camel_case(name):
+    """
+    Convert a snake_case string in CamelCase.
+    http://stackoverflow.com/questions/19053707/convert-snake-case-snake-case-to-lower-camel-case-lowercamelcase-in-python
+    """
+    components = name.split("_")
+    return components[0] + "".join(x.title() for x in components[1:])
+
+
+def to_snake_case(name):
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def resource_name_aliases(name):
+    """Names to look up in the resource mapping: as is, camelCase, PascalCase."""
+    camel_case_name = to_camel_case(name)
+    return name, camel_case_name, camel_case_name[:1].upper() + camel_case_name[1:]
+
+
+# Request bodies of these types are sent as is, without serialization.
+BUFFER_BODY_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+
+def is_stream_body(data):
+    """File-like object or iterator of chunks, it can be read only once."""
+    return hasattr(data, "read") or isinstance(data, (Iterator, AsyncIterator))
+
+
+def is_raw_body(data):
+    """Body that is already serialized: bytes-like, file-like or iterator of chunks."""
+    return isinstance(data, BUFFER_BODY_TYPES) or is_stream_body(data)
+
+
+# Characters of a path segment that are not percent-encoded (RFC 3986 pchar).
+PATH_SEGMENT_SAFE = "!$&'()*+,;=:@-._~"
+_UNSAFE_PATH_CHARS = re.compile(r"[^A-Za-z0-9!$&'()*+,;=:@\-._~]")
+
+_formatter = string.Formatter()
+
+
+class UrlTemplate(object):
+    """
+    Url template of a resource, parsed once, for example "users/{id}/".
+    Values of the fields are formatted as by str.format and encoded as path segments.
+    """
+
+    __slots__ = ("template", "fields", "_format", "_parsed_fields")
+
+    def __init__(self, template):
+        self.template = template
+        # The template with positional fields "{}" and the fields in their order:
+        # (field name, first key, conversion, format spec).
+        literals = []
+        parsed_fields = []
+        for literal, field_name, format_spec, conversion in _formatter.parse(template):
+            literals.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field_name is not None:
+                first_key = re.split(r"[.\[]", field_name, 1)[0]
+                parsed_fields.append((field_name, first_key, conversion, format_spec))
+                literals.append("{}")
+        self._format = "".join(literals)
+        self._parsed_fields = tuple(parsed_fields)
+        self.fields = frozenset(field[1] for field in parsed_fields)
+
+    def missing(self, params):
+        """Sorted names of the fields that are not in params."""
+        return sorted(self.fields.difference(params))
+
+    def fill(self, params):
+        """Raises KeyError if a field is not in params."""
+        if not self.fields:
+            return self.template
+
+        values = []
+        for field_name, first_key, conversion, format_spec in self._parsed_fields:
+            if field_name == first_key:
+                value = params[first_key]
+            else:
+                value = _formatter.get_field(field_name, (), params)[0]
+            if conversion:
+                value = _formatter.convert_field(value, conversion)
+            text = format(value, format_spec)
+            if _UNSAFE_PATH_CHARS.search(text):
+                text = quote(text, safe=PATH_SEGMENT_SAFE)
+            values.append(text)
+        return self._format.format(*values)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_url_template(template):
+    return UrlTemplate(template)
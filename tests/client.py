@@ -1,7 +1,11 @@
 from __future__ import unicode_literals
 
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 from tapi2.adapters import (
-    TapiAdapter, JSONAdapterMixin,
+    TapiAdapter, JSONAdapterMixin, CSVAdapterMixin, TSVAdapterMixin, NDJSONAdapterMixin,
     generate_wrapper_from_adapter
 )
 from tapi2.serializers import SimpleSerializer
@@ -95,3 +99,86 @@ class FailTokenRefreshClientAdapter(TokenRefreshClientAdapter):
 
 
 FailTokenRefreshClient = generate_wrapper_from_adapter(FailTokenRefreshClientAdapter)
+
+
+class OffsetPaginationClientAdapter(TesterClientAdapter):
+
+    def get_iterator_all_page_request_kwargs(self, response_data, response, request_kwargs, api_params, **kwargs):
+        total = response_data.get('total')
+        if total is None:
+            return None
+
+        limit = len(response_data['data'])
+        return [
+            {'params': {'offset': offset, 'limit': limit}}
+            for offset in range(limit, total, limit)
+        ]
+
+
+OffsetPaginationClient = generate_wrapper_from_adapter(OffsetPaginationClientAdapter)
+
+
+class StreamingClientAdapter(TesterClientAdapter):
+    stream_items_path = 'data'
+    stream_chunk_size = 7
+
+
+StreamingClient = generate_wrapper_from_adapter(StreamingClientAdapter)
+
+
+class CSVClientAdapter(CSVAdapterMixin, JSONAdapterMixin, TapiAdapter):
+    api_root = 'https://api.test.com'
+    resource_mapping = RESOURCE_MAPPING
+    stream_chunk_size = 5
+
+
+CSVClient = generate_wrapper_from_adapter(CSVClientAdapter)
+
+
+class TSVClientAdapter(TSVAdapterMixin, TapiAdapter):
+    api_root = 'https://api.test.com'
+    resource_mapping = RESOURCE_MAPPING
+    columns = ['Clicks', 'Date']
+
+
+TSVClient = generate_wrapper_from_adapter(TSVClientAdapter)
+
+
+class NDJSONClientAdapter(NDJSONAdapterMixin, JSONAdapterMixin, TapiAdapter):
+    api_root = 'https://api.test.com'
+    resource_mapping = RESOURCE_MAPPING
+
+
+NDJSONClient = generate_wrapper_from_adapter(NDJSONClientAdapter)
+
+
+class LocalHandler(BaseHTTPRequestHandler):
+    """Responds with the method, path and body of the request."""
+    protocol_version = 'HTTP/1.1'
+
+    def _respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        request_body = self.rfile.read(length).decode() if length else ''
+        body = json.dumps({"method": self.command, "path": self.path, "body": request_body}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+def start_local_server():
+    """Starts HTTP server on a free port, returns the server and the client class for it."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), LocalHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    class LocalClientAdapter(TesterClientAdapter):
+        api_root = 'http://127.0.0.1:%s/' % server.server_address[1]
+        resource_mapping = {'local': {'resource': 'local/'}}
+
+    return server, generate_wrapper_from_adapter(LocalClientAdapter)
@@ -28,3 +28,99 @@ def test_fill_resource_template_url_exception():
         adapter.fill_resource_template_url(template, {}, resource)
     except Exception as exc:
         assert exc.args == ("point() missing 2 required url params: 'city', 'country'",)
+
+
+def test_url_template_values_are_path_segments():
+    adapter = TapiAdapter()
+
+    url = adapter.fill_resource_template_url(
+        "https://api.test.com/{path}/{id:04d}/{{static}}", {"path": "a/b c?", "id": 7}, "point"
+    )
+    assert url == "https://api.test.com/a%2Fb%20c%3F/0007/{static}"
+    assert adapter.fill_resource_template_url("{date}/", {"date": "2020-01-01"}, "point") == "2020-01-01/"
+
+
+def test_url_template_missing_params_are_sorted():
+    adapter = TapiAdapter()
+
+    with pytest.raises(TypeError) as exc_info:
+        adapter.fill_resource_template_url("{country}/{city}/{id}", {"id": 1}, "point")
+    assert exc_info.value.args == ("point() missing 2 required url params: 'city', 'country'",)
+
+
+def test_resource_index_resolves_aliases():
+    from tests.client import TesterClientAdapter
+
+    class CamelCaseAdapter(TesterClientAdapter):
+        resource_mapping = {
+            "reportRows": {"resource": "report/"},
+            "Campaigns": {"resource": "campaigns/"},
+            "user_info": {"resource": "user-info/"},
+        }
+
+    adapter = CamelCaseAdapter()
+
+    assert adapter._resolve_resource_name("report_rows") == "reportRows"
+    assert adapter._resolve_resource_name("reportRows") == "reportRows"
+    assert adapter._resolve_resource_name("campaigns") == "Campaigns"
+    assert adapter._resolve_resource_name("user_info") == "user_info"
+    assert adapter._resolve_resource_name("unknown") is None
+    assert "unknown" in CamelCaseAdapter._resource_index
+    assert adapter._get_resource_url({}, "reportRows") == "https://api.test.com/report/"
+
+
+def test_resource_index_is_rebuilt_after_adding_resources():
+    from tapi2.adapters import Resource
+    from tests.client import TesterClientAdapter
+
+    class ExtendedAdapter(TesterClientAdapter):
+        resource_mapping = {"first": {"resource": "first/"}}
+
+    assert ExtendedAdapter()._resolve_resource_name("second") is None
+
+    adapter = ExtendedAdapter(resource_mapping=[Resource("second", "second/")])
+
+    assert adapter._resolve_resource_name("second") == "second"
+    assert ExtendedAdapter()._resolve_resource_name("second") is None
+    assert "second" not in ExtendedAdapter.resource_mapping
+
+
+def test_resources_of_client_are_not_shared():
+    from tapi2.adapters import Resource
+    from tests.client import TesterClient
+
+    client = TesterClient(resource_mapping=[Resource("secret", "secret/")])
+
+    assert client.secret().data == "https://api.test.com/secret/"
+    with pytest.raises(AttributeError):
+        TesterClient().secret
+
+
+def test_native_methods_are_computed_once_per_class():
+    from tests.client import TesterClientAdapter
+
+    class NativeAdapter(TesterClientAdapter):
+        def to_report(self, data, **kwargs):
+            return data
+
+    assert "to_report" not in TesterClientAdapter().native_methods
+    assert NativeAdapter().native_methods == TesterClientAdapter().native_methods | {"to_report"}
+    assert NativeAdapter().native_methods is NativeAdapter().native_methods
+
+
+def test_streaming_mixin_attributes_are_not_native_methods():
+    from tests.client import CSVClient, CSVClientAdapter, NDJSONClientAdapter, TSVClientAdapter
+
+    for adapter_class in (CSVClientAdapter, TSVClientAdapter, NDJSONClientAdapter):
+        assert adapter_class().native_methods == frozenset()
+    assert "columns" not in dir(CSVClient().test())
+
+
+def test_to_native_methods_dispatch():
+    from decimal import Decimal
+
+    adapter = TapiAdapter()
+
+    assert adapter._get_to_native_method("to_decimal", "1.5")() == Decimal("1.5")
+    with pytest.raises(NotImplementedError):
+        adapter._get_to_native_method("to_unknown", "1.5")()
@@ -0,0 +1,183 @@
+from __future__ import unicode_literals
+
+import io
+import json
+import unittest
+from urllib.parse import parse_qs, urlsplit
+
+from tapi2.adapters import generate_wrapper_from_adapter
+from tapi2.aio import AsyncTapiClient, AsyncTapiClientExecutor
+from tapi2.exceptions import ClientError, ServerError
+from tapi2.transports import AsyncMemoryTransport, _aiter_body
+from tests.client import (
+    OffsetPaginationClient, TesterClient, TesterClientAdapter, TokenRefreshClient
+)
+
+
+class RetryClientAdapter(TesterClientAdapter):
+
+    async def retry_request(self, tapi_exception, error_message, repeat_number, **kwargs):
+        return repeat_number < 3
+
+
+RetryClient = generate_wrapper_from_adapter(RetryClientAdapter)
+
+
+class TestAsyncTapiClient(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.transport = AsyncMemoryTransport()
+        self.wrapper = TesterClient(asynchronous=True, transport=self.transport)
+
+    def test_wrapper_is_async(self):
+        self.assertIsInstance(self.wrapper, AsyncTapiClient)
+        self.assertIsInstance(self.wrapper.test(), AsyncTapiClientExecutor)
+        self.assertEqual(self.wrapper.user(id=1).data, 'https://api.test.com/user/1/')
+
+    async def test_get_request(self):
+        self.transport.add('GET', self.wrapper.test().data, body='{"data": {"key": "value"}}')
+
+        response = await self.wrapper.test().get(params={"a": 1})
+
+        self.assertIsInstance(response, AsyncTapiClient)
+        self.assertEqual(response.data, {'data': {'key': 'value'}})
+        self.assertEqual(response().status_code, 200)
+        request, _ = self.transport.calls[0]
+        self.assertEqual(request.url, 'https://api.test.com/test/?a=1')
+
+    async def test_http_methods(self):
+        for method in ('POST', 'PUT', 'PATCH', 'DELETE'):
+            self.transport.add(method, self.wrapper.test().data, body='{"data": 1}', status=201)
+
+            response = await getattr(self.wrapper.test(), method.lower())(data={"a": 1})
+
+            self.assertEqual(response.data, {'data': 1})
+            self.assertEqual(self.transport.calls[-1][0].body, '{"a": 1}')
+
+    async def test_raises_client_error(self):
+        self.transport.add('GET', self.wrapper.test().data, body='{"error": "bad"}', status=400)
+
+        with self.assertRaises(ClientError) as context:
+            await self.wrapper.test().get()
+
+        self.assertIn("bad", context.exception.args)
+
+    async def test_async_retry_request(self):
+        wrapper = RetryClient(asynchronous=True, transport=self.transport)
+        self.transport.add('GET', wrapper.test().data, status=400)
+        self.transport.add('GET', wrapper.test().data, status=400)
+        self.transport.add('GET', wrapper.test().data, body='{"data": 1}')
+
+        response = await wrapper.test().get()
+
+        self.assertEqual(response.data, {'data': 1})
+        self.assertEqual(len(self.transport.calls), 3)
+
+    async def test_token_expired_automatically_refresh_authentication(self):
+        wrapper = TokenRefreshClient(
+            token='token', refresh_token_by_default=True,
+            asynchronous=True, transport=self.transport
+        )
+        self.transport.add('POST', wrapper.test().data, body=json.dumps({"error": "Token expired"}), status=401)
+        self.transport.add('POST', wrapper.test().data, body='', status=201)
+
+        response = await wrapper.test().post()
+
+        self.assertEqual(response._api_params['token'], 'new_token')
+        self.assertEqual(response().refresh_data, 'new_token')
+
+    async def test_iter_items(self):
+        next_url = 'http://api.teste.com/next_batch'
+        self.transport.add(
+            'GET', self.wrapper.test().data,
+            body='{"data": [{"key": "value"}], "paging": {"next": "%s"}}' % next_url,
+        )
+        self.transport.add(
+            'GET', next_url,
+            body='{"data": [{"key": "value"}, {"key": "value"}], "paging": {"next": ""}}',
+        )
+
+        response = await self.wrapper.test().get()
+        items = [item async for item in response().iter_items()]
+
+        self.assertEqual(items, [{"key": "value"}] * 3)
+
+    async def test_pages_with_max_pages(self):
+        next_url = 'http://api.teste.com/next_batch'
+        self.transport.add(
+            'GET', self.wrapper.test().data,
+            body='{"data": [{"key": "value"}], "paging": {"next": "%s"}}' % next_url,
+        )
+        self.transport.add(
+            'GET', next_url,
+            body='{"data": [{"key": "value"}, {"key": "value"}], "paging": {"next": "%s"}}' % next_url,
+        )
+
+        response = await self.wrapper.test().get()
+        pages = [page async for page in response().pages(max_pages=2)]
+
+        self.assertEqual(len(pages), 2)
+        self.assertIsInstance(pages[0], AsyncTapiClient)
+        self.assertEqual(pages[1]["key"], "value")
+
+    async def test_batch(self):
+        for i in range(3):
+            self.transport.add('GET', self.wrapper.user(id=i).data, body='{"id": %s}' % i)
+        self.transport.add('GET', self.wrapper.user(id=3).data, status=500)
+
+        results = await self.wrapper.batch(
+            [(self.wrapper.user(id=i), 'get') for i in range(4)], max_workers=2
+        )
+
+        self.assertEqual([r.data for r in results[:3]], [{"id": i} for i in range(3)])
+        self.assertIsInstance(results[3], ServerError)
+
+    async def test_iter_batch(self):
+        for i in range(3):
+            self.transport.add('GET', self.wrapper.user(id=i).data, body='{"id": %s}' % i)
+
+        results = {
+            index: result.data
+            async for index, result in self.wrapper.iter_batch(
+                [(self.wrapper.user(id=i), 'get') for i in range(3)]
+            )
+        }
+
+        self.assertEqual(results, {i: {"id": i} for i in range(3)})
+
+    async def test_iter_items_with_prefetch(self):
+        urls = [self.wrapper.test().data] + ['http://api.teste.com/page/%s' % i for i in range(2, 5)]
+        for i, url in enumerate(urls):
+            next_url = urls[i + 1] if i + 1 < len(urls) else ''
+            self.transport.add_json('GET', url, {"data": [i], "paging": {"next": next_url}})
+
+        response = await self.wrapper.test().get()
+        items = [item async for item in response().iter_items(prefetch=2)]
+
+        self.assertEqual(items, [0, 1, 2, 3])
+
+    async def test_iter_items_requests_known_pages_concurrently(self):
+        wrapper = OffsetPaginationClient(asynchronous=True, transport=self.transport)
+
+        def request_callback(request):
+            offset = int(parse_qs(urlsplit(request.url).query).get('offset', ['0'])[0])
+            return 200, {}, json.dumps({"data": [offset, offset + 1], "total": 10})
+
+        self.transport.add('GET', wrapper.test().data, callback=request_callback)
+
+        response = await wrapper.test().get()
+        items = [item async for item in response().iter_items(concurrency=3)]
+
+        self.assertEqual(items, list(range(10)))
+        self.assertEqual(len(self.transport.calls), 5)
+
+
+class TestAsyncBody(unittest.IsolatedAsyncioTestCase):
+
+    async def _read(self, data):
+        return [chunk async for chunk in _aiter_body(data, chunk_size=4)]
+
+    async def test_raw_bodies_are_read_in_chunks(self):
+        self.assertEqual(await self._read(memoryview(b'0123456789')), [b'0123', b'4567', b'89'])
+        self.assertEqual(await self._read(io.BytesIO(b'012345')), [b'0123', b'45'])
+        self.assertEqual(await self._read(iter([b'a', b'b'])), [b'a', b'b'])
@@ -0,0 +1,243 @@
+from __future__ import unicode_literals
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+from urllib.parse import parse_qs, urlsplit
+
+import responses
+
+from tapi2.adapters import Resource
+from tapi2.batching import SingleFlight
+from tapi2.transports import AsyncMemoryTransport, MemoryTransport
+from tests.client import TesterClient
+
+BATCH_RESOURCES = [
+    Resource("items", "https://api.test.com/items/", batch_param="ids", max_batch=3, batch_window=0.05),
+]
+
+
+def items_callback(request):
+    query = parse_qs(urlsplit(request.url).query)
+    ids = ','.join(query['ids']).split(',')
+    data = [{"id": int(id), "name": "item %s" % id} for id in ids if id != '404']
+    return 200, {}, json.dumps({"data": data})
+
+
+class TestRequestBatching(unittest.TestCase):
+
+    def setUp(self):
+        self.wrapper = TesterClient(resource_mapping=BATCH_RESOURCES)
+        responses.add_callback(
+            responses.GET, self.wrapper.items().data,
+            callback=items_callback,
+            content_type='application/json',
+        )
+
+    @responses.activate
+    def test_batch_requests_are_coalesced(self):
+        results = self.wrapper.batch(
+            [(self.wrapper.items(), "get", {"params": {"ids": id}}) for id in [1, 2, 3, 4, 2, 404]]
+        )
+
+        self.assertEqual(len(responses.calls), 2)
+        self.assertEqual(parse_qs(urlsplit(responses.calls[0].request.url).query), {"ids": ["1,2,3"]})
+        self.assertEqual([result.data and result.data["id"] for result in results], [1, 2, 3, 4, 2, None])
+        self.assertEqual(results[0]().response.status_code, 200)
+
+    @responses.activate
+    def test_single_request_is_sent_right_away(self):
+        started = time.monotonic()
+        response = self.wrapper.items().get(params={"ids": 5})
+
+        self.assertLess(time.monotonic() - started, 0.05)
+        self.assertEqual(response.data, {"id": 5, "name": "item 5"})
+        self.assertIsNone(self.wrapper._batcher._scheduler)
+
+    @responses.activate
+    def test_requests_from_threads_are_coalesced(self):
+        wrapper = TesterClient(resource_mapping=[
+            Resource("items", "https://api.test.com/items/", batch_param="ids", batch_window=0.05, batch_threads=True),
+        ])
+        results = {}
+
+        def get(id):
+            results[id] = wrapper.items().get(params={"ids": id}).data
+
+        threads = [threading.Thread(target=get, args=(id,)) for id in [1, 2]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(results, {1: {"id": 1, "name": "item 1"}, 2: {"id": 2, "name": "item 2"}})
+
+    @responses.activate
+    def test_requests_with_several_keys_are_not_batched(self):
+        response = self.wrapper.items().get(params={"ids": [1, 2]})
+
+        self.assertEqual(response.data, {"data": [{"id": 1, "name": "item 1"}, {"id": 2, "name": "item 2"}]})
+
+    @responses.activate
+    def test_batch_error_is_raised_for_every_request(self):
+        responses.replace(responses.GET, self.wrapper.items().data, status=500)
+
+        results = self.wrapper.batch([(self.wrapper.items(), "get", {"params": {"ids": id}}) for id in [1, 2]])
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertIsInstance(results[0], Exception)
+        self.assertIs(results[0], results[1])
+
+
+class TestAsyncRequestBatching(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.transport = AsyncMemoryTransport()
+        self.wrapper = TesterClient(
+            asynchronous=True, transport=self.transport, resource_mapping=BATCH_RESOURCES
+        )
+        self.transport.add('GET', self.wrapper.items().data, callback=items_callback)
+
+    async def test_gathered_requests_are_coalesced(self):
+        results = await self.wrapper.batch(
+            [(self.wrapper.items(), "get", {"params": {"ids": id}}) for id in [1, 2, 3, 4]],
+            max_workers=1,
+        )
+
+        self.assertEqual(len(self.transport.calls), 2)
+        self.assertEqual([result.data["id"] for result in results], [1, 2, 3, 4])
+
+    async def test_single_request(self):
+        response = await self.wrapper.items().get(params={"ids": 5})
+
+        self.assertEqual(response.data, {"id": 5, "name": "item 5"})
+
+
+class SlowMemoryTransport(MemoryTransport):
+
+    def send(self, request_method, url, **kwargs):
+        time.sleep(0.05)
+        return super(SlowMemoryTransport, self).send(request_method, url, **kwargs)
+
+
+class SlowAsyncMemoryTransport(AsyncMemoryTransport):
+
+    async def send(self, request_method, url, **kwargs):
+        await asyncio.sleep(0.05)
+        return await super(SlowAsyncMemoryTransport, self).send(request_method, url, **kwargs)
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_waiting_calls_share_result(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+
+        def slow():
+            started.set()
+            release.wait()
+            return "result"
+
+        def call(function):
+            results.append(flight.do("key", function))
+
+        leader = threading.Thread(target=call, args=(slow,))
+        leader.start()
+        started.wait()
+        followers = [threading.Thread(target=call, args=(lambda: "other",)) for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join()
+
+        self.assertEqual(sorted(results), [("result", False)] + [("result", True)] * 3)
+        self.assertEqual(flight.do("key", lambda: "next"), ("next", False))
+
+    def _concurrent_gets(self, wrapper, count, **kwargs):
+        results = [None] * count
+
+        def get(index):
+            results[index] = wrapper.test().get(**kwargs)
+
+        threads = [threading.Thread(target=get, args=(index,)) for index in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_identical_gets_share_one_request(self):
+        transport = SlowMemoryTransport()
+        wrapper = TesterClient(transport=transport, single_flight=True)
+        transport.add_json('GET', wrapper.test().data, {"data": [1]})
+
+        results = self._concurrent_gets(wrapper, 5, params={"a": 1})
+
+        self.assertEqual(len(transport.calls), 1)
+        self.assertEqual([result.data for result in results], [{"data": [1]}] * 5)
+        self.assertEqual(len({id(result) for result in results}), 5)
+
+    def test_different_requests_are_not_shared(self):
+        transport = SlowMemoryTransport()
+        wrapper = TesterClient(transport=transport, single_flight=True)
+        transport.add_json('GET', wrapper.test().data, {"data": [1]})
+
+        threads = [
+            threading.Thread(target=wrapper.test().get, kwargs={"params": {"a": index}})
+            for index in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(transport.calls), 3)
+
+    def test_single_flight_is_opt_in(self):
+        transport = SlowMemoryTransport()
+        wrapper = TesterClient(transport=transport)
+        transport.add_json('GET', wrapper.test().data, {"data": [1]})
+
+        self._concurrent_gets(wrapper, 3)
+
+        self.assertEqual(len(transport.calls), 3)
+
+
+class TestAsyncSingleFlight(unittest.IsolatedAsyncioTestCase):
+
+    async def test_identical_gets_share_one_request(self):
+        transport = SlowAsyncMemoryTransport()
+        wrapper = TesterClient(asynchronous=True, transport=transport, single_flight=True)
+        transport.add_json('GET', wrapper.test().data, {"data": [1]})
+
+        results = await asyncio.gather(*[wrapper.test().get() for _ in range(5)])
+
+        self.assertEqual(len(transport.calls), 1)
+        self.assertEqual([result.data for result in results], [{"data": [1]}] * 5)
+        self.assertEqual(len({id(result) for result in results}), 5)
+
+    async def test_error_is_raised_for_every_caller(self):
+        transport = SlowAsyncMemoryTransport()
+        wrapper = TesterClient(asynchronous=True, transport=transport, single_flight=True)
+        transport.add('GET', wrapper.test().data, status=500)
+
+        results = await asyncio.gather(*[wrapper.test().get() for _ in range(3)], return_exceptions=True)
+
+        self.assertEqual(len(transport.calls), 1)
+        self.assertTrue(all(isinstance(result, Exception) for result in results))
+
+    async def test_posts_are_not_shared(self):
+        transport = SlowAsyncMemoryTransport()
+        wrapper = TesterClient(asynchronous=True, transport=transport, single_flight=True)
+        transport.add_json('POST', wrapper.test().data, {"data": [1]})
+
+        await asyncio.gather(*[wrapper.test().post() for _ in range(3)])
+
+        self.assertEqual(len(transport.calls), 3)
@@ -0,0 +1,197 @@
+from __future__ import unicode_literals
+
+import tempfile
+import time
+import unittest
+
+import responses
+
+from tapi2.adapters import Resource
+from tapi2.cache import FileCache, MemoryCache, make_cache_key
+from tests.client import TesterClient
+
+
+class TestMakeCacheKey(unittest.TestCase):
+
+    def test_key_does_not_depend_on_params_order(self):
+        key1 = make_cache_key("GET", {"url": "http://a", "params": {"a": 1, "b": 2}})
+        key2 = make_cache_key("get", {"url": "http://a", "params": {"b": 2, "a": 1}})
+
+        self.assertEqual(key1, key2)
+
+    def test_key_depends_on_body_and_selected_headers(self):
+        request_kwargs = {"url": "http://a", "data": '{"a": 1}', "headers": {"Authorization": "1", "X": "1"}}
+        key = make_cache_key("POST", request_kwargs, headers=["authorization"])
+
+        self.assertNotEqual(key, make_cache_key("POST", {**request_kwargs, "data": '{"a": 2}'}, ["authorization"]))
+        self.assertNotEqual(
+            key, make_cache_key("POST", {**request_kwargs, "headers": {"Authorization": "2"}}, ["authorization"])
+        )
+        self.assertEqual(
+            key, make_cache_key("POST", {**request_kwargs, "headers": {"Authorization": "1"}}, ["authorization"])
+        )
+
+
+class TestMemoryCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = MemoryCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.stats(), {"hits": 3, "misses": 1, "revalidations": 0, "size": 2})
+
+    def test_ttl(self):
+        cache = MemoryCache(ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=0.01)
+        time.sleep(0.02)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get_entry("b"), (2, False))
+
+
+class TestFileCache(unittest.TestCase):
+
+    def test_set_get_delete(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = FileCache(directory)
+            cache.set("a", {"data": [1, 2]})
+
+            self.assertEqual(FileCache(directory).get("a"), {"data": [1, 2]})
+
+            cache.delete("a")
+            self.assertIsNone(cache.get("a"))
+            self.assertEqual(cache.stats(), {"hits": 0, "misses": 1, "revalidations": 0})
+
+
+class TestClientCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = MemoryCache()
+        self.wrapper = TesterClient(
+            cache=self.cache,
+            resource_mapping=[
+                Resource("cached_report", "https://api.test.com/report/", cache=True),
+                Resource("not_cached", "https://api.test.com/not-cached/", cache=False),
+            ],
+        )
+
+    def _add(self, method, url):
+        responses.add(method, url,
+                      body='{"data": {"key": "value"}}',
+                      status=200,
+                      content_type='application/json')
+
+    @responses.activate
+    def test_get_request_is_cached(self):
+        self._add(responses.GET, self.wrapper.test().data)
+
+        response1 = self.wrapper.test().get(params={"a": 1})
+        response2 = self.wrapper.test().get(params={"a": 1})
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(response2.data, {"data": {"key": "value"}})
+        self.assertEqual(response2().status_code, 200)
+        self.assertIs(response1.data, response2.data)
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1, "revalidations": 0, "size": 1})
+
+    @responses.activate
+    def test_different_params_are_not_shared(self):
+        self._add(responses.GET, self.wrapper.test().data)
+
+        self.wrapper.test().get(params={"a": 1})
+        self.wrapper.test().get(params={"a": 2})
+
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_post_request_is_not_cached(self):
+        self._add(responses.POST, self.wrapper.test().data)
+
+        self.wrapper.test().post(data={"a": 1})
+        self.wrapper.test().post(data={"a": 1})
+
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_resource_opts_in_and_out(self):
+        self._add(responses.POST, self.wrapper.cached_report().data)
+        self._add(responses.GET, self.wrapper.not_cached().data)
+
+        self.wrapper.cached_report().post(data={"a": 1})
+        self.wrapper.cached_report().post(data={"a": 1})
+        self.wrapper.not_cached().get()
+        self.wrapper.not_cached().get()
+
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_error_response_is_not_cached(self):
+        responses.add(responses.GET, self.wrapper.test().data, status=500)
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                self.wrapper.test().get()
+
+        self.assertEqual(len(responses.calls), 2)
+
+
+class TestConditionalRequests(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = MemoryCache(ttl=0)
+        self.wrapper = TesterClient(cache=self.cache)
+
+    def _add_revalidated(self, validator_headers):
+        def request_callback(request):
+            if request.headers.get('If-None-Match') == '"v1"' or request.headers.get('If-Modified-Since'):
+                return 304, {}, ''
+            return 200, validator_headers, '{"data": [1, 2, 3]}'
+
+        responses.add_callback(
+            responses.GET, self.wrapper.test().data,
+            callback=request_callback,
+            content_type='application/json',
+        )
+
+    @responses.activate
+    def test_not_modified_response_returns_cached_data(self):
+        self._add_revalidated({'ETag': '"v1"'})
+
+        response1 = self.wrapper.test().get()
+        response2 = self.wrapper.test().get()
+
+        self.assertEqual(len(responses.calls), 2)
+        self.assertEqual(responses.calls[1].request.headers['If-None-Match'], '"v1"')
+        self.assertEqual(response2.data, {"data": [1, 2, 3]})
+        self.assertIs(response2.data, response1.data)
+        self.assertEqual(response2().status_code, 200)
+        self.assertEqual(self.cache.revalidations, 1)
+
+    @responses.activate
+    def test_last_modified_validator(self):
+        last_modified = 'Wed, 21 Oct 2015 07:28:00 GMT'
+        self._add_revalidated({'Last-Modified': last_modified})
+
+        self.wrapper.test().get()
+        response = self.wrapper.test().get()
+
+        self.assertEqual(responses.calls[1].request.headers['If-Modified-Since'], last_modified)
+        self.assertEqual(response.data, {"data": [1, 2, 3]})
+
+    @responses.activate
+    def test_without_validators_request_is_not_conditional(self):
+        self._add_revalidated({})
+
+        self.wrapper.test().get()
+        self.wrapper.test().get()
+
+        self.assertNotIn('If-None-Match', responses.calls[1].request.headers)
+        self.assertEqual(self.cache.revalidations, 0)
@@ -0,0 +1,205 @@
+from __future__ import unicode_literals
+
+import unittest
+from unittest import mock
+
+import requests
+import responses
+
+from tapi2.cache import MemoryCache
+from tapi2.exceptions import NotFound404Error, ServerError
+from tapi2.instrumentation import Instrument, LatencyHistogram, MetricsAggregator, RequestEvent
+from tapi2.retry import RetryPolicy
+from tapi2.transports import AsyncMemoryTransport
+from tests.client import TesterClient, TokenRefreshClient
+
+
+class RecordingInstrument(Instrument):
+
+    def __init__(self):
+        self.events = []
+
+    def _record(hook):
+        def record(self, event):
+            self.events.append((hook, event.attempt, event.status_code, dict(event.timings)))
+        return record
+
+    on_request_start = _record('on_request_start')
+    on_response = _record('on_response')
+    on_retry = _record('on_retry')
+    on_refresh = _record('on_refresh')
+    on_error = _record('on_error')
+
+    def on_page(self, event):
+        self.events.append(('on_page', event.page, event.status_code, event.response_bytes))
+
+    def hooks(self):
+        return [event[0] for event in self.events]
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram(buckets=(0.1, 0.2, 0.5))
+        for value in [0.05] * 50 + [0.15] * 45 + [0.3] * 4 + [1.0]:
+            histogram.observe(value)
+
+        self.assertAlmostEqual(histogram.percentile(50), 0.1)
+        self.assertAlmostEqual(histogram.percentile(95), 0.2)
+        self.assertAlmostEqual(histogram.percentile(99), 0.5)
+        self.assertEqual(histogram.percentile(100), 0.5)
+        self.assertIsNone(LatencyHistogram().percentile(50))
+
+    def test_event_timings(self):
+        event = RequestEvent('test', 'GET', started=0)
+        event.mark('prepare')
+        event.mark('send')
+
+        self.assertEqual(sorted(event.timings), ['prepare', 'send', 'total'])
+        self.assertGreaterEqual(event.timings['total'], event.timings['prepare'] + event.timings['send'])
+
+
+class TestInstrumentedClient(unittest.TestCase):
+
+    @responses.activate
+    def test_events_of_request(self):
+        instrument = RecordingInstrument()
+        wrapper = TesterClient(instruments=[instrument])
+        responses.add(responses.POST, wrapper.test().data, body='{"data": 1}', content_type='application/json')
+
+        wrapper.test().post(data=b'12345')
+
+        self.assertEqual(instrument.hooks(), ['on_request_start', 'on_response'])
+        hook, attempt, status_code, timings = instrument.events[1]
+        self.assertEqual((attempt, status_code), (1, 200))
+        self.assertEqual(sorted(timings), ['prepare', 'process', 'send', 'total'])
+
+    @responses.activate
+    def test_byte_counts(self):
+        events = []
+        instrument = Instrument()
+        instrument.on_response = events.append
+        wrapper = TesterClient(instruments=[instrument])
+        responses.add(responses.POST, wrapper.test().data, body='{"data": 1}', content_type='application/json')
+
+        wrapper.test().post(data=b'12345')
+
+        self.assertEqual((events[0].request_bytes, events[0].response_bytes), (5, 11))
+        self.assertEqual(events[0].resource_name, 'test')
+
+    @responses.activate
+    @mock.patch('tapi2.tapi.time.sleep')
+    def test_retries_and_errors(self, sleep):
+        instrument = RecordingInstrument()
+        wrapper = TesterClient(instruments=[instrument], retry_policy=RetryPolicy(max_attempts=2))
+        responses.add(responses.GET, wrapper.test().data, status=503)
+
+        with self.assertRaises(ServerError):
+            wrapper.test().get()
+
+        self.assertEqual(instrument.hooks(), ['on_request_start', 'on_retry', 'on_request_start', 'on_error'])
+        self.assertEqual([event[1:3] for event in instrument.events[1::2]], [(1, 503), (2, 503)])
+
+    @responses.activate
+    def test_transport_error(self):
+        instrument = RecordingInstrument()
+        wrapper = TesterClient(instruments=[instrument])
+        responses.add(responses.GET, wrapper.test().data, body=requests.ConnectionError('reset'))
+
+        with self.assertRaises(requests.ConnectionError):
+            wrapper.test().get()
+
+        self.assertEqual(instrument.hooks(), ['on_request_start', 'on_error'])
+
+    @responses.activate
+    def test_refresh(self):
+        instrument = RecordingInstrument()
+        wrapper = TokenRefreshClient(token='token', refresh_token_by_default=True, instruments=[instrument])
+        statuses = [401, 200]
+        responses.add_callback(
+            responses.GET, wrapper.test().data,
+            callback=lambda request: (statuses.pop(0), {}, '{}'),
+            content_type='application/json',
+        )
+
+        wrapper.test().get()
+
+        self.assertEqual(instrument.hooks(), ['on_request_start', 'on_refresh', 'on_request_start', 'on_response'])
+        self.assertIn('refresh', instrument.events[1][3])
+
+    @responses.activate
+    def test_not_modified_response(self):
+        instrument = RecordingInstrument()
+        wrapper = TesterClient(cache=MemoryCache(ttl=0), instruments=[instrument])
+        responses.add(responses.GET, wrapper.test().data, body='{}', headers={'ETag': '"v1"'},
+                      content_type='application/json')
+        responses.add(responses.GET, wrapper.test().data, status=304)
+
+        wrapper.test().get()
+        response = wrapper.test().get()
+
+        self.assertEqual(response.data, {})
+        self.assertEqual(instrument.hooks(), ['on_request_start', 'on_response'] * 2)
+        self.assertEqual(instrument.events[3][2], 304)
+
+    @responses.activate
+    def test_pages(self):
+        instrument = RecordingInstrument()
+        wrapper = TesterClient(instruments=[instrument])
+        next_url = 'http://api.example.org/next_batch'
+        responses.add(responses.GET, wrapper.test().data,
+                      body='{"data": [1, 2], "paging": {"next": "%s"}}' % next_url,
+                      content_type='application/json')
+        responses.add(responses.GET, next_url, body='{"data": [3], "paging": {"next": ""}}',
+                      content_type='application/json')
+
+        items = list(wrapper.test().get()().iter_items())
+
+        self.assertEqual(items, [1, 2, 3])
+        pages = [event for event in instrument.events if event[0] == 'on_page']
+        self.assertEqual([page[1:3] for page in pages], [(1, 200), (2, 200)])
+
+    @responses.activate
+    def test_aggregator(self):
+        metrics = MetricsAggregator()
+        wrapper = TesterClient(instruments=[metrics])
+        responses.add(responses.GET, wrapper.test().data, body='{}', content_type='application/json')
+        responses.add(responses.GET, wrapper.user(id=1).data, status=404)
+
+        for _ in range(3):
+            wrapper.test().get()
+        with self.assertRaises(NotFound404Error):
+            wrapper.user(id=1).get()
+
+        stats = metrics.to_dict()
+        self.assertEqual(stats['test']['count'], 3)
+        self.assertEqual((stats['user']['count'], stats['user']['errors']), (1, 1))
+        self.assertLessEqual(stats['test']['p50'], stats['test']['p99'])
+
+        text = metrics.to_prometheus()
+        self.assertIn('tapi_request_duration_seconds_bucket{resource="test",le="+Inf"} 3\n', text)
+        self.assertIn('tapi_request_duration_seconds_count{resource="user"} 1\n', text)
+        self.assertIn('tapi_request_errors_total{resource="user"} 1\n', text)
+
+    def test_no_instruments(self):
+        self.assertEqual(TesterClient()._instruments, ())
+
+
+class TestAsyncInstrumentedClient(unittest.IsolatedAsyncioTestCase):
+
+    async def test_events_of_request(self):
+        instrument = RecordingInstrument()
+        transport = AsyncMemoryTransport()
+        wrapper = TesterClient(asynchronous=True, transport=transport, instruments=[instrument])
+        next_url = 'http://api.example.org/next_batch'
+        transport.add_json('GET', wrapper.test().data, {'data': [1], 'paging': {'next': next_url}})
+        transport.add_json('GET', next_url, {'data': [2]})
+
+        response = await wrapper.test().get()
+        items = [item async for item in response().iter_items()]
+
+        self.assertEqual(items, [1, 2])
+        self.assertEqual(
+            instrument.hooks(),
+            ['on_request_start', 'on_response', 'on_page', 'on_request_start', 'on_response', 'on_page'],
+        )
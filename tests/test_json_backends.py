@@ -0,0 +1,81 @@
+from __future__ import unicode_literals
+
+import unittest
+from unittest import mock
+
+import responses
+
+from tapi2 import json_backends
+from tapi2.json_backends import StdlibJSONBackend, get_json_backend
+from tests.client import TesterClient
+
+
+class TestGetJSONBackend(unittest.TestCase):
+
+    def setUp(self):
+        json_backends._backends.clear()
+
+    def tearDown(self):
+        json_backends._backends.clear()
+
+    def test_stdlib_backend(self):
+        backend = get_json_backend("json")
+
+        self.assertEqual(backend.name, "json")
+        self.assertEqual(backend.loads(' {"a": [1, "и"]} '.encode()), {"a": [1, "и"]})
+        self.assertEqual(backend.loads(backend.dumps({"a": 1})), {"a": 1})
+
+    def test_stdlib_backend_detects_encoding(self):
+        backend = get_json_backend("json")
+
+        self.assertEqual(backend.loads(b'\xef\xbb\xbf{"a": 1}'), {"a": 1})
+        self.assertEqual(backend.loads('{"a": 1}'.encode("utf-16")), {"a": 1})
+        with self.assertRaises(ValueError):
+            backend.loads(b"{")
+
+    def test_falls_back_when_backend_is_not_installed(self):
+        def import_module(name):
+            raise ImportError(name)
+
+        with mock.patch.object(json_backends.importlib, "import_module", import_module):
+            self.assertIsInstance(get_json_backend("orjson"), StdlibJSONBackend)
+            self.assertIsInstance(get_json_backend("auto"), StdlibJSONBackend)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_json_backend("simplejson")
+
+    def test_fast_backends_encode_and_decode_bytes(self):
+        for name in ("orjson", "ujson"):
+            backend = get_json_backend(name)
+            data = {"a": [1, 2.5, None, "и"], "b": {"c": True}}
+
+            self.assertEqual(backend.loads(backend.dumps(data)), data)
+            self.assertEqual(backend.loads('{"a": 1}'.encode()), {"a": 1})
+
+
+class TestClientJSONBackend(unittest.TestCase):
+
+    @responses.activate
+    def test_client_with_json_backend(self):
+        wrapper = TesterClient(json_backend="auto")
+        responses.add(responses.POST, wrapper.test().data,
+                      body='  {"data": {"key": "значение"}}\n',
+                      status=200,
+                      content_type='application/json')
+
+        response = wrapper.test().post(data={"a": 1})
+
+        self.assertEqual(response.data, {"data": {"key": "значение"}})
+        self.assertEqual(wrapper._api._json.loads(responses.calls[0].request.body), {"a": 1})
+        self.assertIs(response._api._json, wrapper._api._json)
+
+    @responses.activate
+    def test_not_json_response_returns_text(self):
+        wrapper = TesterClient(json_backend="auto")
+        responses.add(responses.GET, wrapper.test().data,
+                      body='not json',
+                      status=200,
+                      content_type='text/plain')
+
+        self.assertEqual(wrapper.test().get().data, 'not json')
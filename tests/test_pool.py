@@ -0,0 +1,60 @@
+from __future__ import unicode_literals
+
+import unittest
+
+from tapi2.pool import PoolConfig, PooledHTTPAdapter
+from tests.client import start_local_server
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server, cls.client_class = start_local_server()
+        cls.url = cls.client_class().local().data
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _client(self, **config):
+        return self.client_class(pool=PoolConfig(**config))
+
+    def test_connection_is_reused_by_child_clients(self):
+        client = self._client(pool_maxsize=2)
+
+        response = client.local().get()
+        response.local().get()
+        client.local().get()
+
+        self.assertIsInstance(client._session.get_adapter(self.url), PooledHTTPAdapter)
+        self.assertEqual(client.pool_stats(), {"created": 1, "reused": 2, "in_use": 0, "idle": 1, "reaped": 0})
+
+    def test_expired_connections_are_reopened(self):
+        client = self._client(max_lifetime=0)
+
+        client.local().get()
+        client.local().get()
+
+        self.assertEqual(client.pool_stats()["created"], 2)
+        self.assertEqual(client.pool_stats()["reused"], 0)
+
+    def test_idle_connections_are_reaped(self):
+        client = self._client(max_idle_time=0)
+        client.local().get()
+
+        self.assertEqual(client.reap_idle_connections(), 1)
+        self.assertEqual(client.reap_idle_connections(), 0)
+        self.assertEqual(client.pool_stats()["idle"], 0)
+        self.assertEqual(client.pool_stats()["reaped"], 1)
+
+    def test_adapter_keeps_pool_config(self):
+        config = PoolConfig(pool_maxsize=2, pool_block=True)
+        adapter = self._client()._session.get_adapter(self.url)
+        configured = PooledHTTPAdapter(config)
+
+        self.assertIs(configured.pool_config, config)
+        self.assertEqual(configured.config, {})
+        self.assertEqual((configured._pool_maxsize, configured._pool_block), (2, True))
+        self.assertIsInstance(adapter.pool_config, PoolConfig)
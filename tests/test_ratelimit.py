@@ -0,0 +1,100 @@
+from __future__ import unicode_literals
+
+import unittest
+from unittest import mock
+
+import responses
+
+from tapi2.adapters import Resource, generate_wrapper_from_adapter
+from tapi2.ratelimit import RateLimiter, TokenBucket
+from tapi2.transports import AsyncMemoryTransport
+from tests.client import TesterClient, TesterClientAdapter
+
+
+class HeadersRateLimitAdapter(TesterClientAdapter):
+
+    def update_rate_limit(self, rate_limiter, response, **kwargs):
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is not None:
+            rate_limiter.update(remaining=int(remaining), reset_after=int(response.headers['X-RateLimit-Reset']))
+
+
+HeadersRateLimitClient = generate_wrapper_from_adapter(HeadersRateLimitAdapter)
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    @mock.patch('tapi2.ratelimit.time.monotonic', return_value=100.0)
+    def test_burst_then_rate(self, monotonic):
+        bucket = TokenBucket(rate=2, per=1, burst=3)
+
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 0])
+        self.assertEqual(bucket.reserve(), 0.5)
+        self.assertEqual(bucket.reserve(2), 1.5)
+
+        monotonic.return_value = 110.0
+        self.assertEqual(bucket.reserve(), 0)
+
+    @mock.patch('tapi2.ratelimit.time.monotonic', return_value=100.0)
+    def test_limiter_waits_for_the_slowest_bucket(self, monotonic):
+        limiter = RateLimiter(TokenBucket(10), TokenBucket(60, per=60, burst=1))
+
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertEqual(limiter.reserve(), 1.0)
+
+    @mock.patch('tapi2.ratelimit.time.monotonic', return_value=100.0)
+    def test_update_from_server_limits(self, monotonic):
+        bucket = TokenBucket(10)
+        bucket.update(remaining=0, reset_after=2)
+
+        self.assertEqual(bucket.reserve(), 2.1)
+
+
+class TestClientRateLimit(unittest.TestCase):
+
+    def _add(self, url, headers=None):
+        responses.add(responses.GET, url, body='{}', status=200, headers=headers or {},
+                      content_type='application/json')
+
+    @responses.activate
+    @mock.patch('tapi2.tapi.time.sleep')
+    def test_requests_wait_for_tokens(self, sleep):
+        wrapper = TesterClient(
+            rate_limiter=TokenBucket(rate=10, burst=1),
+            resource_mapping=[Resource("heavy", "https://api.test.com/heavy/", rate_cost=5)],
+        )
+        self._add(wrapper.test().data)
+        self._add(wrapper.heavy().data)
+
+        wrapper.test().get()
+        wrapper.heavy().get()
+
+        self.assertEqual(len(responses.calls), 2)
+        self.assertEqual(sleep.call_count, 1)
+        self.assertAlmostEqual(sleep.call_args[0][0], 0.5, places=2)
+
+    @responses.activate
+    @mock.patch('tapi2.tapi.time.sleep')
+    def test_limits_are_updated_from_response(self, sleep):
+        wrapper = HeadersRateLimitClient(rate_limiter=TokenBucket(rate=100))
+        self._add(wrapper.test().data, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '3'})
+
+        wrapper.test().get()
+        wrapper.test().get()
+
+        self.assertAlmostEqual(sleep.call_args[0][0], 3.0, places=1)
+
+
+class TestAsyncClientRateLimit(unittest.IsolatedAsyncioTestCase):
+
+    @mock.patch('tapi2.aio.asyncio.sleep')
+    async def test_requests_wait_for_tokens(self, sleep):
+        transport = AsyncMemoryTransport()
+        wrapper = TesterClient(asynchronous=True, transport=transport, rate_limiter=TokenBucket(rate=10, burst=1))
+        transport.add('GET', wrapper.test().data, body='{}')
+
+        await wrapper.test().get()
+        await wrapper.test().get()
+
+        self.assertEqual(len(transport.calls), 2)
+        self.assertAlmostEqual(sleep.call_args[0][0], 0.1, places=2)
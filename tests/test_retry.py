@@ -0,0 +1,185 @@
+from __future__ import unicode_literals
+
+import unittest
+from unittest import mock
+
+import requests
+import responses
+
+from tapi2.adapters import generate_wrapper_from_adapter
+from tapi2.exceptions import ServerError
+from tapi2.retry import RetryPolicy
+from tapi2.transports import AsyncMemoryTransport
+from tests.client import TesterClient, TesterClientAdapter
+
+
+class VetoRetryClientAdapter(TesterClientAdapter):
+
+    def retry_request(self, tapi_exception, error_message, repeat_number, response, retry=False, **kwargs):
+        return retry and response.status_code != 501
+
+
+VetoRetryClient = generate_wrapper_from_adapter(VetoRetryClientAdapter)
+
+
+class AlwaysRetryClientAdapter(TesterClientAdapter):
+
+    def retry_request(self, tapi_exception, error_message, repeat_number, response, retry=False, **kwargs):
+        return repeat_number < 3
+
+
+AlwaysRetryClient = generate_wrapper_from_adapter(AlwaysRetryClientAdapter)
+
+
+def response_sequence(*statuses):
+    statuses = list(statuses)
+
+    def callback(request):
+        status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+        if isinstance(status, Exception):
+            raise status
+        return status, {}, '{"data": 1}'
+
+    return callback
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def _response(self, status, headers=None):
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers or {})
+        return response
+
+    def test_exponential_backoff(self):
+        policy = RetryPolicy(max_attempts=5, backoff_factor=1, backoff_max=5, jitter=False)
+        response = self._response(503)
+
+        self.assertEqual([policy.get_retry_delay(attempt, 0, response) for attempt in range(1, 6)], [1, 2, 4, 5, None])
+
+    def test_jitter_is_up_to_backoff(self):
+        policy = RetryPolicy(backoff_factor=1)
+
+        self.assertTrue(all(0 <= policy.get_retry_delay(2, 0, self._response(500)) <= 2 for _ in range(100)))
+
+    def test_retry_after_and_deadline(self):
+        policy = RetryPolicy(deadline=10)
+
+        self.assertEqual(policy.get_retry_delay(1, 0, self._response(429, {'Retry-After': '7'})), 7)
+        self.assertIsNone(policy.get_retry_delay(1, 5, self._response(429, {'Retry-After': '7'})))
+        self.assertIsNone(policy.get_retry_delay(1, 0, self._response(400)))
+
+    def test_exceptions(self):
+        policy = RetryPolicy()
+
+        self.assertIsNotNone(policy.get_retry_delay(1, 0, exception=requests.ConnectionError()))
+        self.assertIsNone(policy.get_retry_delay(1, 0, exception=ValueError()))
+
+
+    def test_methods(self):
+        policy = RetryPolicy()
+
+        self.assertIsNotNone(policy.get_retry_delay(1, 0, self._response(502), request_method='get'))
+        self.assertIsNone(policy.get_retry_delay(1, 0, self._response(502), request_method='POST'))
+        self.assertIsNone(policy.get_retry_delay(1, 0, exception=requests.ConnectionError(), request_method='PATCH'))
+        self.assertIsNotNone(RetryPolicy(methods=None).get_retry_delay(1, 0, self._response(502), request_method='POST'))
+
+@mock.patch('tapi2.tapi.time.sleep')
+class TestClientRetries(unittest.TestCase):
+
+    def _add(self, wrapper, *statuses):
+        responses.add_callback(
+            responses.GET, wrapper.test().data,
+            callback=response_sequence(*statuses),
+            content_type='application/json',
+        )
+
+    @responses.activate
+    def test_failed_request_is_repeated_after_backoff(self, sleep):
+        wrapper = TesterClient(retry_policy=RetryPolicy(jitter=False))
+        self._add(wrapper, 503, 502, 200)
+
+        response = wrapper.test().get()
+
+        self.assertEqual(response.data, {"data": 1})
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual([call[0][0] for call in sleep.call_args_list], [0.5, 1.0])
+
+    @responses.activate
+    def test_transport_errors_are_repeated(self, sleep):
+        wrapper = TesterClient(retry_policy=RetryPolicy(max_attempts=2))
+        self._add(wrapper, requests.ConnectionError("reset"), 200)
+
+        self.assertEqual(wrapper.test().get().data, {"data": 1})
+
+        self._add(wrapper, requests.Timeout("timeout"))
+        with self.assertRaises(requests.Timeout):
+            wrapper.test().get()
+
+    @responses.activate
+    def test_many_retries_do_not_grow_the_stack(self, sleep):
+        wrapper = TesterClient(retry_policy=RetryPolicy(max_attempts=2000, backoff_factor=0))
+        self._add(wrapper, *([500] * 1500 + [200]))
+
+        self.assertEqual(wrapper.test().get().data, {"data": 1})
+
+    @responses.activate
+    def test_post_is_not_repeated_by_default(self, sleep):
+        wrapper = TesterClient(retry_policy=RetryPolicy())
+        responses.add_callback(
+            responses.POST, wrapper.test().data,
+            callback=response_sequence(requests.ConnectionError("reset"), 200),
+            content_type='application/json',
+        )
+
+        with self.assertRaises(requests.ConnectionError):
+            wrapper.test().post(data={"a": 1})
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_adapter_can_veto_policy(self, sleep):
+        wrapper = VetoRetryClient(retry_policy=RetryPolicy(statuses=[501]))
+        self._add(wrapper, 501, 200)
+
+        with self.assertRaises(ServerError):
+            wrapper.test().get()
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_stream_body_is_not_repeated(self, sleep):
+        wrapper = TesterClient(retry_policy=RetryPolicy(methods=None))
+        responses.add_callback(
+            responses.POST, wrapper.test().data,
+            callback=response_sequence(503, 200),
+            content_type='application/json',
+        )
+
+        with self.assertRaises(ServerError):
+            wrapper.test().post(data=iter([b'{}']))
+
+
+    @responses.activate
+    def test_stream_body_is_not_repeated_by_adapter(self, sleep):
+        wrapper = AlwaysRetryClient()
+        responses.add_callback(
+            responses.POST, wrapper.test().data,
+            callback=response_sequence(503, 200),
+            content_type='application/json',
+        )
+
+        with self.assertRaises(ServerError):
+            wrapper.test().post(data=iter([b'{}']))
+        self.assertEqual(len(responses.calls), 1)
+
+class TestAsyncClientRetries(unittest.IsolatedAsyncioTestCase):
+
+    @mock.patch('tapi2.aio.asyncio.sleep')
+    async def test_transport_errors_are_repeated(self, sleep):
+        transport = AsyncMemoryTransport()
+        wrapper = TesterClient(asynchronous=True, transport=transport, retry_policy=RetryPolicy())
+        transport.add('GET', wrapper.test().data, callback=response_sequence(requests.ConnectionError(), 503, 200))
+
+        response = await wrapper.test().get()
+
+        self.assertEqual(response.data, {"data": 1})
+        self.assertEqual(sleep.call_count, 2)
@@ -0,0 +1,73 @@
+from __future__ import unicode_literals
+
+import unittest
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+
+from tapi2.serializers import SimpleSerializer
+
+
+class DateSerializer(SimpleSerializer):
+
+    def serialize_date(self, data):
+        return data.isoformat()
+
+
+class OverriddenSerializer(SimpleSerializer):
+
+    def serialize(self, data):
+        if isinstance(data, date):
+            return data.isoformat()
+        return super(OverriddenSerializer, self).serialize(data)
+
+
+class IntSerializer(SimpleSerializer):
+
+    def serialize_int(self, data):
+        return str(data)
+
+
+class TestSerializer(unittest.TestCase):
+
+    def setUp(self):
+        self.serializer = SimpleSerializer()
+
+    def test_nested_values_are_serialized(self):
+        data = {"rows": [{"id": 1, "cost": Decimal("1.5")}, {"id": 2, "cost": None}]}
+
+        self.assertEqual(
+            self.serializer.serialize(data),
+            {"rows": [{"id": 1, "cost": "1.5"}, {"id": 2, "cost": None}]},
+        )
+        self.assertEqual(data["rows"][0]["cost"], Decimal("1.5"))
+
+    def test_containers_without_changes_are_not_copied(self):
+        row = {"id": 2, "name": "row", "tags": ["a"]}
+        data = {"rows": [{"cost": Decimal("1.5")}, row]}
+
+        serialized = self.serializer.serialize(data)
+
+        self.assertIsNot(serialized, data)
+        self.assertIs(serialized["rows"][1], row)
+
+    def test_subclasses_use_method_of_base_class(self):
+        serializer = DateSerializer()
+        data = OrderedDict([("day", date(2020, 1, 2)), ("time", datetime(2020, 1, 2, 3, 4))])
+
+        self.assertEqual(
+            serializer.serialize(data),
+            {"day": "2020-01-02", "time": "2020-01-02T03:04:00"},
+        )
+        self.assertEqual(self.serializer.serialize(date(2020, 1, 2)), date(2020, 1, 2))
+
+    def test_overridden_serialize_is_used_for_nested_values(self):
+        serializer = OverriddenSerializer()
+
+        self.assertEqual(
+            serializer.serialize({"d": date(2020, 1, 2), "rows": [date(2020, 1, 3), Decimal("1")]}),
+            {"d": "2020-01-02", "rows": ["2020-01-03", "1"]},
+        )
+
+    def test_bool_is_not_serialized_as_int(self):
+        self.assertEqual(IntSerializer().serialize({"id": 1, "active": True}), {"id": "1", "active": True})
@@ -0,0 +1,204 @@
+from __future__ import unicode_literals
+
+import csv
+import io
+import json
+import unittest
+from decimal import Decimal
+
+import responses
+
+from tapi2.serializers import SimpleSerializer
+from tapi2.streaming import JSONArrayBody, iter_json_array_chunks, iter_json_items
+from tests.client import CSVClient, NDJSONClient, StreamingClient, TSVClient
+
+
+def chunked(text, size):
+    data = text.encode('utf-8')
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class TestIterJSONItems(unittest.TestCase):
+
+    def test_root_array(self):
+        records = [{"id": i, "name": "имя %s" % i, "value": 12345.678, "tags": [1, None, True]} for i in range(50)]
+        text = json.dumps(records)
+
+        for size in (1, 2, 3, 64):
+            self.assertEqual(list(iter_json_items(chunked(text, size))), records)
+
+    def test_numbers_split_across_chunks(self):
+        text = '[1.5, 2.25, 3e10, -4E-2, 1e+3, {"a": 1.25}, 10]'
+
+        for size in range(1, 9):
+            self.assertEqual(list(iter_json_items(chunked(text, size))), json.loads(text))
+
+        text = '{"total": 12.5, "data": [1.5, 2]}'
+        for size in range(1, 9):
+            self.assertEqual(list(iter_json_items(chunked(text, size), path="data")), [1.5, 2])
+
+    def test_nested_path(self):
+        text = ' { "total": 3, "meta": {"a": [1, {"b": "]"}]}, "result" : {"rows": [1, 22, 333] }, "after": 1} '
+
+        self.assertEqual(list(iter_json_items(chunked(text, 2), path=("result", "rows"))), [1, 22, 333])
+
+    def test_empty_array_and_missing_key(self):
+        self.assertEqual(list(iter_json_items(chunked('{"data": [ ]}', 1), path="data")), [])
+        self.assertEqual(list(iter_json_items(chunked('{"other": [1]}', 1), path="data")), [])
+
+    def test_is_lazy(self):
+        def chunks():
+            yield b'[1, 2, '
+            raise AssertionError("must not be read")
+
+        items = iter_json_items(chunks())
+        self.assertEqual(next(items), 1)
+
+    def test_invalid_document(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_items(chunked('{"data": 1}', 3)))
+        with self.assertRaises(ValueError):
+            list(iter_json_items(chunked('[1, 2', 3)))
+
+
+class TestJSONArrayChunks(unittest.TestCase):
+
+    def test_chunks_make_json_array(self):
+        records = [{"id": i, "name": "имя"} for i in range(100)]
+
+        chunks = list(iter_json_array_chunks(iter(records), json.dumps, chunk_size=100, batch_size=3))
+
+        self.assertGreater(len(chunks), 10)
+        self.assertEqual(json.loads(b''.join(chunks)), records)
+        self.assertEqual(list(iter_json_array_chunks([], json.dumps)), [b'[]'])
+
+
+class TestStreamedRequests(unittest.TestCase):
+
+    @responses.activate
+    def test_json_array_body_is_serialized_by_record(self):
+        wrapper = StreamingClient(serializer_class=SimpleSerializer)
+        responses.add(responses.POST, wrapper.test().data, body='{}', content_type='application/json')
+        records = ({"id": i, "cost": Decimal("1.5")} for i in range(3))
+
+        wrapper.test().post(data=JSONArrayBody(records))
+
+        request = responses.calls[0].request
+        self.assertEqual(request.headers['Transfer-Encoding'], 'chunked')
+        self.assertEqual(
+            json.loads(b''.join(request.body)),
+            [{"id": 0, "cost": "1.5"}, {"id": 1, "cost": "1.5"}, {"id": 2, "cost": "1.5"}],
+        )
+
+
+class TestStreamedResponses(unittest.TestCase):
+
+    def setUp(self):
+        self.wrapper = StreamingClient()
+
+    @responses.activate
+    def test_streamed_response_items(self):
+        records = [{"id": i} for i in range(20)]
+        responses.add(responses.GET, self.wrapper.test().data,
+                      body=json.dumps({"data": records, "paging": {"next": "http://api.teste.com/next"}}),
+                      status=200,
+                      content_type='application/json')
+
+        response = self.wrapper.test().get(stream=True)
+
+        self.assertNotIsInstance(response.data, (list, dict))
+        self.assertEqual(list(response().iter_items()), records)
+
+    @responses.activate
+    def test_streamed_response_items_with_max_items(self):
+        responses.add(responses.GET, self.wrapper.test().data,
+                      body=json.dumps({"data": list(range(20))}),
+                      status=200,
+                      content_type='application/json')
+
+        response = self.wrapper.test().get(stream=True)
+
+        self.assertEqual(list(response().items(max_items=3)), [0, 1, 2])
+
+    @responses.activate
+    def test_streamed_error_response_is_processed_as_usual(self):
+        responses.add(responses.GET, self.wrapper.test().data,
+                      body='{"error": "bad request"}',
+                      status=400,
+                      content_type='application/json')
+
+        with self.assertRaises(Exception) as context:
+            self.wrapper.test().get(stream=True)
+
+        self.assertIn("bad request", context.exception.args)
+
+
+class TestStreamingLinesAdapters(unittest.TestCase):
+
+    @responses.activate
+    def test_csv_rows(self):
+        client = CSVClient()
+        responses.add(responses.GET, client.test().data,
+                      body='id,name\r\n1,"a, b"\r\n2,имя\r\n',
+                      status=200,
+                      content_type='text/csv')
+
+        response = client.test().get()
+
+        self.assertEqual(
+            list(response().iter_items()),
+            [{"id": "1", "name": "a, b"}, {"id": "2", "name": "имя"}]
+        )
+
+    @responses.activate
+    def test_csv_quoted_newlines_and_empty_lines(self):
+        client = CSVClient()
+        body = 'id,text\r\n1,"line one\r\n\r\nline three"\r\n\r\n2,"a\n\nb"\n'
+        responses.add(responses.GET, client.test().data, body=body, status=200, content_type='text/csv')
+
+        response = client.test().get()
+
+        rows = list(response().iter_items())
+
+        self.assertEqual(rows, [{"id": "1", "text": "line one\r\n\r\nline three"}, {"id": "2", "text": "a\n\nb"}])
+        self.assertEqual(rows, list(csv.DictReader(io.StringIO(body, newline=''))))
+
+    @responses.activate
+    def test_csv_error_response_is_processed_by_json_adapter(self):
+        client = CSVClient()
+        responses.add(responses.GET, client.test().data,
+                      body='{"error": "bad request"}',
+                      status=400,
+                      content_type='application/json')
+
+        with self.assertRaises(Exception) as context:
+            client.test().get()
+
+        self.assertIn("bad request", context.exception.args)
+
+    @responses.activate
+    def test_tsv_rows_with_columns_projection(self):
+        client = TSVClient()
+        responses.add(responses.GET, client.test().data,
+                      body='Date\tCampaign\tClicks\n2020-01-01\tabc\t10\n2020-01-02\tdef\t20\n',
+                      status=200,
+                      content_type='text/tab-separated-values')
+
+        response = client.test().get(params={"a": 1})
+
+        self.assertEqual(
+            list(response().items()),
+            [{"Clicks": "10", "Date": "2020-01-01"}, {"Clicks": "20", "Date": "2020-01-02"}]
+        )
+
+    @responses.activate
+    def test_ndjson_records(self):
+        client = NDJSONClient()
+        responses.add(responses.GET, client.test().data,
+                      body='{"id": 1}\n\n{"id": 2}\n',
+                      status=200,
+                      content_type='application/x-ndjson')
+
+        response = client.test().get()
+
+        self.assertEqual(list(response().iter_items(max_items=5)), [{"id": 1}, {"id": 2}])
@@ -1,5 +1,6 @@
 from __future__ import unicode_literals
 
+import io
 import json
 import unittest
 
@@ -7,7 +8,9 @@ import responses
 
 from tapi2.adapters import Resource
 from tapi2.exceptions import ClientError, ServerError
-from tests.client import TesterClient, TokenRefreshClient, FailTokenRefreshClient
+from tests.client import (
+    TesterClient, TokenRefreshClient, FailTokenRefreshClient, OffsetPaginationClient
+)
 
 
 class TestTapiClient(unittest.TestCase):
@@ -31,7 +34,7 @@ class TestTapiClient(unittest.TestCase):
             content_type='application/json'
         )
 
-        response = self.wrapper.myresource().get()
+        response = wrapper.myresource().get()
         assert response.data == []
 
     def test_fill_url_template(self):
@@ -48,6 +51,30 @@ class TestTapiClient(unittest.TestCase):
 
         self.assertEqual(resource.data, expected_url)
 
+    @responses.activate
+    def test_wrapped_results_share_adapter_and_store(self):
+        responses.add(responses.GET, self.wrapper.test().data,
+                      body='[{"key": "value"}]',
+                      status=200,
+                      content_type='application/json')
+
+        response = self.wrapper.test().get()
+        item = response()
+        item.store["key"] = "value"
+
+        self.assertIs(item._api, self.wrapper._api)
+        self.assertIs(item._session, self.wrapper._session)
+        self.assertEqual(self.wrapper.store, {"key": "value"})
+
+    def test_wrapped_results_are_slotted(self):
+        client = self.wrapper._wrap_in_tapi([0, 1, 2])
+        executor = client()
+
+        self.assertFalse(hasattr(client, '__dict__'))
+        self.assertFalse(hasattr(executor, '__dict__'))
+        self.assertEqual(executor.data, [0, 1, 2])
+        self.assertIs(executor.store, self.wrapper.store)
+
     def test_calling_len_on_tapioca_list(self):
         client = self.wrapper._wrap_in_tapi([0, 1, 2])
         self.assertEqual(len(client), 3)
@@ -107,10 +134,27 @@ class TestTapiClient(unittest.TestCase):
         with self.assertRaises(IndexError):
             response[3]
 
+    def test_undeclared_resource_raises_attribute_error(self):
+        with self.assertRaises(AttributeError):
+            self.wrapper.undeclared_resource
+
+        with self.assertRaises(AttributeError):
+            self.wrapper.undeclared_resource
+
+    def test_camel_case_resource_fallback(self):
+        self.assertEqual(self.wrapper.anotherRoot().data, 'https://api.another.com/another-root/')
+
     def test_fill_url_from_default_params(self):
         wrapper = TesterClient(default_url_params={'id': 123})
         self.assertEqual(wrapper.user().data, 'https://api.test.com/user/123/')
 
+    def test_url_params_do_not_change_default_params(self):
+        wrapper = TesterClient(default_url_params={'id': 123})
+
+        self.assertEqual(wrapper.user(id=1).data, 'https://api.test.com/user/1/')
+        self.assertEqual(wrapper.user().data, 'https://api.test.com/user/123/')
+        self.assertEqual(wrapper._api_params['default_url_params'], {'id': 123})
+
 
 class TestTapiExecutor(unittest.TestCase):
 
@@ -231,6 +275,36 @@ class TestTapiExecutorRequests(unittest.TestCase):
 
         self.assertEqual(response.data, {"data": {"key": "value"}})
 
+    @responses.activate
+    def test_raw_bodies_are_sent_as_is(self):
+        responses.add(responses.POST, self.wrapper.test().data,
+                      body='{}',
+                      status=200,
+                      content_type='application/json')
+        body = bytearray(b'{"rows": []}')
+
+        self.wrapper.test().post(data=body)
+        self.wrapper.test().post(data=memoryview(body))
+        self.wrapper.test().post(data=io.BytesIO(b'file'))
+
+        self.assertIs(responses.calls[0].request.body, body)
+        self.assertEqual(bytes(responses.calls[1].request.body), b'{"rows": []}')
+        self.assertEqual(responses.calls[2].request.body, b'file')
+        self.assertEqual(responses.calls[2].request.headers['Content-Length'], '4')
+
+    @responses.activate
+    def test_generator_body_is_chunked(self):
+        responses.add(responses.POST, self.wrapper.test().data,
+                      body='{}',
+                      status=200,
+                      content_type='application/json')
+
+        self.wrapper.test().post(data=(chunk for chunk in [b'{"rows": ', b'[]}']))
+
+        request = responses.calls[0].request
+        self.assertEqual(request.headers['Transfer-Encoding'], 'chunked')
+        self.assertEqual(b''.join(request.body), b'{"rows": []}')
+
     @responses.activate
     def test_post_request(self):
         responses.add(responses.POST, self.wrapper.test().data,
@@ -439,6 +513,119 @@ class TestIteratorFeatures(unittest.TestCase):
         self.assertEqual(iterations_count, 0)
 
 
+    def _add_numbered_pages(self, count):
+        urls = [self.wrapper.test().data] + [
+            'http://api.teste.com/page/%s' % i for i in range(2, count + 1)
+        ]
+        for i, url in enumerate(urls):
+            next_url = urls[i + 1] if i + 1 < count else ''
+            responses.add(responses.GET, url,
+                          body=json.dumps({"data": [i * 2, i * 2 + 1], "paging": {"next": next_url}}),
+                          status=200,
+                          content_type='application/json')
+
+    @responses.activate
+    def test_iter_items_with_prefetch(self):
+        self._add_numbered_pages(5)
+
+        response = self.wrapper.test().get()
+        items = list(response().iter_items(prefetch=2))
+
+        self.assertEqual(items, list(range(10)))
+        self.assertEqual(len(responses.calls), 5)
+
+    @responses.activate
+    def test_iter_items_with_prefetch_does_not_request_over_max_pages(self):
+        self._add_numbered_pages(5)
+
+        response = self.wrapper.test().get()
+        items = list(response().iter_items(max_pages=3, prefetch=5))
+
+        self.assertEqual(items, list(range(6)))
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_pages_with_prefetch(self):
+        self._add_numbered_pages(3)
+
+        response = self.wrapper.test().get()
+        pages = [page.data for page in response().pages(prefetch=1)]
+
+        self.assertEqual(pages, list(range(6)))
+
+    @responses.activate
+    def test_prefetch_raises_error_of_next_page(self):
+        next_url = 'http://api.teste.com/next_batch'
+        responses.add(responses.GET, self.wrapper.test().data,
+                      body='{"data": [1], "paging": {"next": "%s"}}' % next_url,
+                      status=200,
+                      content_type='application/json')
+        responses.add(responses.GET, next_url, status=500)
+
+        response = self.wrapper.test().get()
+        items = response().iter_items(prefetch=2)
+
+        self.assertEqual(next(items), 1)
+        with self.assertRaises(ServerError):
+            next(items)
+
+
+class TestKnownPagesIterator(unittest.TestCase):
+
+    def setUp(self):
+        self.wrapper = OffsetPaginationClient()
+
+    def _add_offset_pages(self, total, limit):
+        def request_callback(request):
+            offset = int(request.params.get('offset', 0))
+            body = {"data": list(range(offset, min(offset + limit, total))), "total": total}
+            return 200, {}, json.dumps(body)
+
+        responses.add_callback(
+            responses.GET, self.wrapper.test().data,
+            callback=request_callback,
+            content_type='application/json',
+        )
+
+    @responses.activate
+    def test_iter_items_requests_known_pages_concurrently(self):
+        self._add_offset_pages(total=20, limit=2)
+
+        response = self.wrapper.test().get()
+        items = list(response().iter_items(concurrency=4))
+
+        self.assertEqual(items, list(range(20)))
+        self.assertEqual(len(responses.calls), 10)
+
+    @responses.activate
+    def test_iter_items_unordered(self):
+        self._add_offset_pages(total=20, limit=2)
+
+        response = self.wrapper.test().get()
+        items = list(response().iter_items(concurrency=4, ordered=False))
+
+        self.assertEqual(sorted(items), list(range(20)))
+
+    @responses.activate
+    def test_iter_items_known_pages_sequentially_with_max_pages(self):
+        self._add_offset_pages(total=20, limit=2)
+
+        response = self.wrapper.test().get()
+        items = list(response().iter_items(max_pages=3))
+
+        self.assertEqual(items, list(range(6)))
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_pages_requests_known_pages_concurrently(self):
+        self._add_offset_pages(total=7, limit=3)
+
+        response = self.wrapper.test().get()
+        pages = [page.data for page in response().pages(concurrency=2)]
+
+        self.assertEqual(pages, list(range(7)))
+
+
 class TestTokenRefreshing(unittest.TestCase):
 
     def setUp(self):
@@ -457,6 +644,21 @@ class TestTokenRefreshing(unittest.TestCase):
         with self.assertRaises(ClientError):
             no_refresh_client.test().post()
 
+    @responses.activate
+    def test_stream_body_is_not_sent_again_after_refresh(self):
+        statuses = [401, 201]
+        responses.add_callback(
+            responses.POST, self.wrapper.test().data,
+            callback=lambda request: (statuses.pop(0), {}, ''),
+            content_type='application/json',
+        )
+
+        with self.assertRaises(ClientError):
+            self.wrapper.test().post(data=io.BytesIO(b'payload'))
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(self.wrapper._api_params['token'], 'new_token')
+
     @responses.activate
     def test_disable_token_refreshing(self):
         responses.add_callback(
@@ -535,3 +737,66 @@ class TestTokenRefreshing(unittest.TestCase):
         response = self.wrapper.test().post()
 
         self.assertEqual(response().refresh_data, 'new_token')
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.wrapper = TesterClient()
+
+    @responses.activate
+    def test_batch_returns_results_in_order(self):
+        for i in range(5):
+            responses.add(responses.GET, self.wrapper.user(id=i).data,
+                          body='{"id": %s}' % i,
+                          status=200,
+                          content_type='application/json')
+
+        results = self.wrapper.batch(
+            [(self.wrapper.user(id=i), 'get') for i in range(5)], max_workers=3
+        )
+
+        self.assertEqual([result.data for result in results], [{"id": i} for i in range(5)])
+
+    @responses.activate
+    def test_batch_captures_exceptions(self):
+        responses.add(responses.GET, self.wrapper.user(id=1).data,
+                      body='{"id": 1}',
+                      status=200,
+                      content_type='application/json')
+        responses.add(responses.POST, self.wrapper.user(id=2).data,
+                      body='{"error": "bad request"}',
+                      status=400,
+                      content_type='application/json')
+
+        results = self.wrapper.batch([
+            (self.wrapper.user(id=1), 'GET', {'params': {'a': 1}}),
+            (self.wrapper.user(id=2), 'post', {'data': {'a': 1}}),
+        ])
+
+        self.assertEqual(results[0].data, {"id": 1})
+        self.assertIsInstance(results[1], ClientError)
+
+    @responses.activate
+    def test_iter_batch_yields_indexes(self):
+        for i in range(3):
+            responses.add(responses.GET, self.wrapper.user(id=i).data,
+                          body='{"id": %s}' % i,
+                          status=200,
+                          content_type='application/json')
+
+        results = dict(self.wrapper.iter_batch(
+            [(self.wrapper.user(id=i), 'get') for i in range(3)]
+        ))
+
+        self.assertEqual({i: r.data for i, r in results.items()}, {i: {"id": i} for i in range(3)})
+
+    def test_batch_does_not_change_session_pools(self):
+        adapter = self.wrapper._session.get_adapter('https://')
+        poolmanager = adapter.poolmanager
+
+        self.wrapper.batch([], max_workers=50)
+
+        self.assertIs(self.wrapper._session.get_adapter('https://'), adapter)
+        self.assertIs(adapter.poolmanager, poolmanager)
+        self.assertEqual(adapter._pool_maxsize, 10)
@@ -0,0 +1,189 @@
+from __future__ import unicode_literals
+
+import json
+import unittest
+
+import requests
+
+from tapi2.exceptions import ClientError
+from tapi2.transports import (
+    HttpxAsyncTransport,
+    HttpxTransport,
+    MemoryTransport,
+    RequestsTransport,
+    Urllib3Transport,
+)
+from tests.client import NDJSONClient, StreamingClient, TesterClient, start_local_server
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def httpx_handler(request):
+    if request.url.path == '/error/':
+        raise httpx.ConnectError('refused', request=request)
+    if request.url.params.get('format') == 'ndjson':
+        return httpx.Response(200, content=b'{"id": 1}\n{"id": 2}\n')
+    body = {"data": [{"id": 1}, {"id": 2}], "method": request.method, "body": request.content.decode()}
+    return httpx.Response(200, json=body)
+
+
+class TestMemoryTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = MemoryTransport()
+        self.wrapper = TesterClient(transport=self.transport)
+
+    def test_default_transport_is_requests(self):
+        self.assertIsInstance(TesterClient()._transport, RequestsTransport)
+        self.assertIs(self.wrapper.test()._transport, self.transport)
+
+    def test_get_request(self):
+        self.transport.add_json('GET', self.wrapper.test().data, {"data": {"key": "value"}})
+
+        response = self.wrapper.test().get(params={"a": 1})
+
+        self.assertEqual(response.data, {"data": {"key": "value"}})
+        request, _ = self.transport.calls[0]
+        self.assertEqual(request.url, 'https://api.test.com/test/?a=1')
+
+    def test_post_request_and_error(self):
+        self.transport.add('POST', self.wrapper.test().data, callback=lambda request: (201, {}, request.body))
+        self.transport.add('GET', self.wrapper.test().data, status=400, body='{"error": "bad"}')
+
+        response = self.wrapper.test().post(data={"a": 1})
+        with self.assertRaises(ClientError):
+            self.wrapper.test().get()
+
+        self.assertEqual(response.data, {"a": 1})
+        self.assertEqual(response().status_code, 201)
+
+    def test_calls_are_bounded(self):
+        transport = MemoryTransport(max_calls=2)
+        wrapper = TesterClient(transport=transport)
+        transport.add_json('GET', wrapper.test().data, {})
+
+        for number in range(3):
+            wrapper.test().get(params={"n": number})
+
+        self.assertEqual([request.url[-1] for request, _ in transport.calls], ['1', '2'])
+
+        transport = MemoryTransport(max_calls=0)
+        transport.add_json('GET', wrapper.test().data, {})
+        TesterClient(transport=transport).test().get()
+        self.assertEqual(len(transport.calls), 0)
+
+
+class TestUrllib3Transport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server, cls.client_class = start_local_server()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.wrapper = self.client_class(transport=Urllib3Transport())
+
+    def test_requests(self):
+        response = self.wrapper.local().get(params={"a": 1})
+        post_response = self.wrapper.local().post(data={"a": 1})
+        chunked_response = self.wrapper.local().post(data=iter([b'{"a": ', b'2}']))
+
+        self.assertEqual(response.data, {"method": "GET", "path": "/local/?a=1", "body": ""})
+        self.assertEqual(response().response.headers['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(post_response.data["body"]), {"a": 1})
+        self.assertEqual(chunked_response.data["method"], "POST")
+
+    def test_stream_response(self):
+        response = self.wrapper.local().get(stream=True)
+
+        self.assertEqual(b''.join(response().response.iter_content(4)), json.dumps(
+            {"method": "GET", "path": "/local/", "body": ""}).encode())
+
+    def test_client_arguments(self):
+        with self.assertRaisesRegex(TypeError, "Urllib3Transport does not support the 'cert' argument"):
+            self.wrapper.local().get(cert='client.pem')
+
+    def test_read_response_content_is_iterated(self):
+        response = Urllib3Transport().send('GET', self.wrapper.local().data)
+
+        self.assertEqual(b''.join(response.iter_content(16)), response.content)
+        self.assertTrue(response.content)
+
+    def test_connection_error(self):
+        with self.assertRaises(requests.ConnectionError):
+            self.wrapper.local().get(url='http://127.0.0.1:1/')
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestHttpxTransport(unittest.TestCase):
+
+    def setUp(self):
+        client = httpx.Client(transport=httpx.MockTransport(httpx_handler))
+        self.wrapper = TesterClient(transport=HttpxTransport(client=client))
+
+    def test_requests(self):
+        response = self.wrapper.test().post(data={"a": 1})
+
+        self.assertEqual(response.data["method"], "POST")
+        self.assertEqual(json.loads(response.data["body"]), {"a": 1})
+        self.assertIsInstance(response().response, requests.Response)
+
+    def test_connection_error(self):
+        with self.assertRaises(requests.ConnectionError):
+            self.wrapper.test().get(url='https://api.test.com/error/')
+
+    def test_client_arguments(self):
+        response = self.wrapper.test().get(verify=True, cert=None, proxies={})
+
+        self.assertEqual(response.data["method"], "GET")
+        with self.assertRaisesRegex(TypeError, "HttpxTransport does not support the 'verify' argument"):
+            self.wrapper.test().get(verify=False)
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestHttpxAsyncTransport(unittest.IsolatedAsyncioTestCase):
+
+    def _transport(self):
+        return HttpxAsyncTransport(client=httpx.AsyncClient(transport=httpx.MockTransport(httpx_handler)))
+
+    async def test_response_is_requests_response(self):
+        wrapper = TesterClient(asynchronous=True, transport=self._transport())
+
+        response = await wrapper.test().post(data=b'raw')
+
+        self.assertEqual((response.data["method"], response.data["body"]), ("POST", "raw"))
+        self.assertIsInstance(response().response, requests.Response)
+        self.assertEqual(response().response.headers['Content-Type'], 'application/json')
+
+    async def test_streamed_json_response(self):
+        wrapper = StreamingClient(asynchronous=True, transport=self._transport())
+
+        response = await wrapper.test().get(stream=True)
+
+        self.assertEqual([item async for item in response().items()], [{"id": 1}, {"id": 2}])
+
+    async def test_streamed_lines_response(self):
+        wrapper = NDJSONClient(asynchronous=True, transport=self._transport())
+
+        response = await wrapper.test().get(params={"format": "ndjson"})
+
+        self.assertEqual([item async for item in response().items()], [{"id": 1}, {"id": 2}])
+
+    async def test_client_arguments(self):
+        wrapper = TesterClient(asynchronous=True, transport=self._transport())
+
+        with self.assertRaisesRegex(TypeError, "HttpxAsyncTransport does not support the 'proxies' argument"):
+            await wrapper.test().get(proxies={"https": "http://proxy:3128"})
+
+    async def test_connection_error(self):
+        wrapper = TesterClient(asynchronous=True, transport=self._transport())
+
+        with self.assertRaises(requests.ConnectionError):
+            await wrapper.test().get(url='https://api.test.com/error/')